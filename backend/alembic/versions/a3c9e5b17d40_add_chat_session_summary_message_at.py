@@ -0,0 +1,33 @@
+"""Add chat_sessions.summary_message_at so the summary boundary is a (created_at, id) key
+
+Revision ID: a3c9e5b17d40
+Revises: e7b2c4d8f913
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e5b17d40'
+down_revision: Union[str, Sequence[str], None] = 'e7b2c4d8f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Chat messages are ordered by (created_at, id); ids alone are not in that order once
+    # several workers insert buffered messages, so the boundary carries both.
+    op.add_column('chat_sessions', sa.Column('summary_message_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE chat_sessions SET summary_message_at = "
+        "(SELECT created_at FROM chat_messages WHERE chat_messages.id = chat_sessions.summary_message_id) "
+        "WHERE summary_message_id IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('chat_sessions', 'summary_message_at')
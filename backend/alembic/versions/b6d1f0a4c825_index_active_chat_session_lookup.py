@@ -0,0 +1,27 @@
+"""Index chat_sessions (user_id, ended_at) for the active-session lookup
+
+Revision ID: b6d1f0a4c825
+Revises: a3c9e5b17d40
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1f0a4c825'
+down_revision: Union[str, Sequence[str], None] = 'a3c9e5b17d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every chat turn looks up the user's session with ended_at IS NULL.
+    op.create_index('ix_chat_sessions_user_id_ended_at', 'chat_sessions', ['user_id', 'ended_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_sessions_user_id_ended_at', table_name='chat_sessions')
@@ -0,0 +1,59 @@
+"""Add composite indexes for per-user / per-parent time-range queries
+
+Merges the goals and accountability heads.
+
+Revision ID: c4e8a71d2b90
+Revises: 71a13cf0a542, 9f2b1c3a1add
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a71d2b90'
+down_revision: Union[str, Sequence[str], None] = ('71a13cf0a542', '9f2b1c3a1add')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # goals.suggest_times / replan: blocks for a user in a window, excluding canceled.
+    # end_at is INCLUDEd so the overlap check is answered from the index (PostgreSQL only).
+    op.create_index(
+        'ix_schedule_blocks_user_id_start_at_status',
+        'schedule_blocks',
+        ['user_id', 'start_at', 'status'],
+        postgresql_include=['end_at'],
+    )
+
+    # Newest-first history and keyset pages: (parent, created_at, id) serves both
+    # directions, since PostgreSQL can scan a btree backwards.
+    op.create_index('ix_mood_checkins_user_id_created_at_id', 'mood_checkins', ['user_id', 'created_at', 'id'])
+    op.create_index('ix_chat_messages_session_id_created_at_id', 'chat_messages', ['session_id', 'created_at', 'id'])
+    op.create_index('ix_group_messages_group_id_created_at_id', 'group_messages', ['group_id', 'created_at', 'id'])
+    op.create_index('ix_wellbeing_suggestions_user_id_created_at', 'wellbeing_suggestions', ['user_id', 'created_at'])
+
+    # is_member / leave_group lookups; a user can only be in a group once.
+    # Drop duplicate memberships first (keep the earliest) so the unique index can be built.
+    op.execute(
+        """
+        DELETE FROM group_members
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM group_members GROUP BY group_id, user_id
+        )
+        """
+    )
+    op.create_index('ux_group_members_group_id_user_id', 'group_members', ['group_id', 'user_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_group_members_group_id_user_id', table_name='group_members')
+    op.drop_index('ix_wellbeing_suggestions_user_id_created_at', table_name='wellbeing_suggestions')
+    op.drop_index('ix_group_messages_group_id_created_at_id', table_name='group_messages')
+    op.drop_index('ix_chat_messages_session_id_created_at_id', table_name='chat_messages')
+    op.drop_index('ix_mood_checkins_user_id_created_at_id', table_name='mood_checkins')
+    op.drop_index('ix_schedule_blocks_user_id_start_at_status', table_name='schedule_blocks')
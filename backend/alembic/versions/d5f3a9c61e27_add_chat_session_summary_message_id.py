@@ -0,0 +1,27 @@
+"""Add chat_sessions.summary_message_id for rolling conversation summaries
+
+Revision ID: d5f3a9c61e27
+Revises: c4e8a71d2b90
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f3a9c61e27'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a71d2b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Last chat message folded into chat_sessions.summary; later messages are not summarized yet.
+    op.add_column('chat_sessions', sa.Column('summary_message_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('chat_sessions', 'summary_message_id')
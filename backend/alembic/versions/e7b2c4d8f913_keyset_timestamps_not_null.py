@@ -0,0 +1,53 @@
+"""Make keyset sort timestamps non-null with microsecond precision
+
+Revision ID: e7b2c4d8f913
+Revises: d5f3a9c61e27
+Create Date: 2026-10-18 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c4d8f913'
+down_revision: Union[str, Sequence[str], None] = 'd5f3a9c61e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column) pairs that lead a (timestamp, id) keyset in app.crud
+KEYSET_TIMESTAMPS = [
+    ('mood_checkins', 'created_at'),
+    ('chat_sessions', 'started_at'),
+    ('chat_messages', 'created_at'),
+    ('pair_nudges', 'created_at'),
+    ('intervention_sessions', 'started_at'),
+    ('courses', 'created_at'),
+    ('assignments', 'created_at'),
+    ('goals', 'created_at'),
+    ('group_members', 'joined_at'),
+    ('group_messages', 'created_at'),
+    ('activity_sessions', 'started_at'),
+]
+
+
+def upgrade() -> None:
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    for table, column in KEYSET_TIMESTAMPS:
+        # A NULL drops out of the (timestamp, id) row comparison, so the row never shows up on a page.
+        op.execute(f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP WHERE {column} IS NULL")
+        if sqlite:
+            # SQLite keeps timestamps as text and CURRENT_TIMESTAMP has no fraction, while a
+            # cursor value is bound as 'YYYY-MM-DD HH:MM:SS.ffffff'; pad so the two compare equal.
+            op.execute(f"UPDATE {table} SET {column} = {column} || '.000000' WHERE length({column}) = 19")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DateTime(timezone=True), nullable=False)
+
+
+def downgrade() -> None:
+    for table, column in KEYSET_TIMESTAMPS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DateTime(timezone=True), nullable=True)
@@ -1,10 +1,13 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import deps
 from app.crud import acct_pair, acct_nudge
+from app.crud.crud_accountability import NUDGE_KEYSET
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
 
 router = APIRouter()
 
@@ -29,14 +32,20 @@ def create_pair(
 @router.get("/pairs/{pair_id}/nudges", response_model=List[schemas.PairNudge])
 def list_nudges(
     *,
+    response: Response,
     db: Session = Depends(deps.get_db),
     pair_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     pairs = acct_pair.get_pairs_for_user(db, user_id=current_user.id)
     if not any(p.id == pair_id for p in pairs):
         raise HTTPException(status_code=403, detail="Not part of this pair")
-    return acct_nudge.get_by_pair(db, pair_id=pair_id)
+    nudges = acct_nudge.get_by_pair(db, pair_id=pair_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, nudges, limit, NUDGE_KEYSET)
+    return json_list(schemas.PairNudge, nudges, response)
 
 @router.post("/pairs/{pair_id}/nudge", response_model=schemas.PairNudge)
 def create_nudge(
@@ -1,21 +1,26 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas
-from app.crud.crud_activity import activity_session
+from app.crud.crud_activity import ACTIVITY_KEYSET, activity_session
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
 from app.api import deps
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.ActivitySession])
 def read_activity_sessions(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
-    sessions = activity_session.get_multi_by_user(db=db, user_id=current_user.id, skip=skip, limit=limit)
-    return sessions
+    sessions = activity_session.get_multi_by_user(db=db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, sessions, limit, ACTIVITY_KEYSET)
+    return json_list(schemas.ActivitySession, sessions, response)
 
 @router.post("/", response_model=schemas.ActivitySession)
 def start_activity_session(
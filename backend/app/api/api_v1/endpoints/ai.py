@@ -1,6 +1,7 @@
 from typing import Any, List, Optional
 from pydantic import BaseModel
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
@@ -25,21 +26,21 @@ def generate_breakdown(
     )
     return subtasks
 
-@router.post("/replan-week", response_model=List[schemas.ScheduleBlockCreate])
+@router.post("/replan-week", response_model=List[schemas.ScheduleBlockCreate], dependencies=[Depends(deps.rate_limit("ai_replan_week"))])
 async def replan_week(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Replan the user's week based on pending assignments and mood.
     """
     # Fetch pending assignments
-    assignments = crud.assignment.get_multi_by_owner(
+    assignments = await crud.assignment.get_multi_by_owner_async(
         db=db, owner_id=current_user.id, status="NOT_STARTED", limit=20
     )
     # Recent mood logs
-    recent_moods = crud.mood_checkin.get_multi_by_owner(db=db, owner_id=current_user.id, limit=5)
+    recent_moods = await crud.mood_checkin.get_multi_by_owner_async(db=db, owner_id=current_user.id, limit=5)
     # Convert ORM to dict
     mood_dicts = [
         {
@@ -79,7 +80,7 @@ async def extract_assignment_text(
     result = await ai_service.extract_assignment_text(req.text)
     return result
 
-@router.post("/analyze-mood", response_model=schemas.MoodInsight)
+@router.post("/analyze-mood", response_model=schemas.MoodInsight, dependencies=[Depends(deps.rate_limit("mood_analyze"))])
 def analyze_mood(
     *,
     db: Session = Depends(deps.get_db),
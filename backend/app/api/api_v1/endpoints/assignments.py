@@ -1,22 +1,29 @@
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.crud import crud_assignment as asg
 from app.api import deps
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Assignment])
 def read_assignments(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
+    _: None = Depends(deps.etag("assignments")),
 ) -> Any:
-    assignments = asg.get_assignments(db, user_id=current_user.id, skip=skip, limit=limit)
-    return assignments
+    assignments = asg.get_assignments(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, assignments, limit, asg.ASSIGNMENT_KEYSET)
+    return json_list(schemas.Assignment, assignments, response)
 
 @router.post("/", response_model=schemas.Assignment)
 def create_assignment(
@@ -70,14 +77,14 @@ def delete_assignment(
 @router.post("/{id}/plan", response_model=List[schemas.Subtask])
 async def generate_assignment_plan(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     id: int,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Generate a study plan (subtasks) for an assignment using AI.
     """
-    assignment = asg.get_assignment(db, assignment_id=id, user_id=current_user.id)
+    assignment = await asg.get_assignment_async(db, assignment_id=id, user_id=current_user.id)
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
 
@@ -89,16 +96,19 @@ async def generate_assignment_plan(
         assignment_description=assignment.description
     )
     
-    # Create subtasks from plan
-    created_subtasks = []
-    for step in plan:
-        subtask_in = schemas.SubtaskCreate(
-            title=step["title"],
-            estimated_minutes=step["estimated_minutes"],
-            order_index=step["order"]
-        )
-        subtask = asg.create_subtask(db, subtask=subtask_in, assignment_id=assignment.id)
-        created_subtasks.append(subtask)
+    # Create subtasks from plan in a single INSERT ... RETURNING
+    created_subtasks = await asg.create_subtasks_async(
+        db,
+        assignment,
+        [
+            schemas.SubtaskCreate(
+                title=step["title"],
+                estimated_minutes=step["estimated_minutes"],
+                order_index=step["order"]
+            )
+            for step in plan
+        ],
+    )
         
     # Mark assignment as having an AI plan
     # assignment.ai_generated_plan = True
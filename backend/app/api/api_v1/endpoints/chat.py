@@ -1,17 +1,79 @@
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
-from datetime import datetime, timedelta
 from app.api import deps
+from app.crud.crud_chat import CHAT_MESSAGE_KEYSET, CHAT_SESSION_KEYSET
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
+from app.db.session import AsyncSessionLocal
+from app.core.config import settings
+from app.services import jobs
+from app.services.chat_context import get_chat_context
+from app.services.chat_history import get_history, record_message
+from app.services.chat_writer import chat_writer
+from app.services.llm_metrics import chat_ttft
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def _persist_message(
+    db: AsyncSession, history: Dict[str, Any], *, session_id: int, user_id: int, role: str, content: str
+) -> None:
+    if settings.CHAT_WRITE_BEHIND:
+        if not chat_writer.submit(session_id=session_id, user_id=user_id, role=role, content=content):
+            await chat_writer.flush()  # buffer full: drain it first so the session stays in order
+            await crud.chat_message.create_for_session_async(
+                db, session_id=session_id, user_id=user_id, role=role, content=content
+            )
+    else:
+        await crud.chat_message.create_for_session_async(
+            db, session_id=session_id, user_id=user_id, role=role, content=content
+        )
+    if record_message(history, session_id, role, content):
+        jobs.enqueue_chat_summary(session_id)
+
+async def _start_turn(
+    db: AsyncSession, history: Dict[str, Any], current_user: models.User, content: str, session_id: Optional[int]
+) -> Optional[int]:
+    # Create a chat session if the user has no active one (tolerate DB errors)
+    try:
+        if session_id is None:
+            active_session = await crud.chat_session.create_with_user_async(db=db, obj_in=schemas.ChatSessionCreate(), user_id=current_user.id)
+            session_id = active_session.id
+    except Exception:
+        await db.rollback()
+        session_id = None
 
-@router.post("/ask", response_model=schemas.ChatMessage)
+    # Save the user's message (best-effort)
+    try:
+        if session_id:
+            await _persist_message(db, history, session_id=session_id, user_id=current_user.id, role="user", content=content)
+    except Exception:
+        await db.rollback()
+
+    return session_id
+
+async def _save_reply(
+    db: AsyncSession, history: Dict[str, Any], session_id: Optional[int], user_id: int, content: str
+) -> None:
+    # Save the assistant's message (best-effort)
+    try:
+        if session_id:
+            await _persist_message(db, history, session_id=session_id, user_id=user_id, role="assistant", content=content)
+    except Exception:
+        await db.rollback()
+
+@router.post("/ask", response_model=schemas.ChatMessage, dependencies=[Depends(deps.rate_limit("chat_ask"))])
 async def ask_assignwell(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     message: schemas.ChatMessage,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
@@ -21,91 +83,10 @@ async def ask_assignwell(
     # Use AIService to generate response
     from app.services.ai_service import ai_service
 
-    # Build rich context from user data
-    now = datetime.utcnow()
-    upcoming_limit = now + timedelta(days=3)
-
-    assignments = crud.assignment.get_multi_by_owner(db=db, owner_id=current_user.id, limit=30)
-    upcoming = []
-    overdue_count = 0
-    next_item = None
-    for a in assignments:
-        due = getattr(a, "due_at", None)
-        status = (getattr(a, "status", "") or "").upper()
-        if not due:
-            continue
-        try:
-            # due may be datetime; ensure comparison in UTC
-            due_dt = due if isinstance(due, datetime) else datetime.fromisoformat(str(due))
-        except Exception:
-            continue
-        if due_dt < now and status != "COMPLETED":
-            overdue_count += 1
-        if now <= due_dt <= upcoming_limit:
-            upcoming.append({
-                "title": getattr(a, "title", "Untitled"),
-                "due_at": due_dt.isoformat(),
-                "importance_level": getattr(a, "importance_level", ""),
-            })
-    if assignments:
-        try:
-            next_item_obj = min(
-                [a for a in assignments if getattr(a, "due_at", None)],
-                key=lambda x: getattr(x, "due_at")
-            )
-            next_item = {
-                "title": getattr(next_item_obj, "title", "Untitled"),
-                "due_at": getattr(next_item_obj, "due_at").isoformat() if isinstance(getattr(next_item_obj, "due_at"), datetime) else str(getattr(next_item_obj, "due_at"))
-            }
-        except Exception:
-            next_item = None
-
-    moods = crud.mood_checkin.get_multi_by_owner(db=db, owner_id=current_user.id, limit=5)
-    mood_history = [
-        {
-            "mood_valence": getattr(m, "mood_valence", None),
-            "energy_level": getattr(m, "energy_level", None),
-            "stress_level": getattr(m, "stress_level", None),
-            "sleep_hours_last_night": getattr(m, "sleep_hours_last_night", None),
-            "created_at": getattr(m, "created_at", None).isoformat() if getattr(m, "created_at", None) else None,
-        }
-        for m in moods
-    ]
-
-    context = {
-        "user_name": current_user.full_name,
-        "upcoming_assignments": upcoming,
-        "overdue_count": overdue_count,
-        "next_assignment": next_item,
-        "mood_history": mood_history,
-    }
-
-    # Get or create an active chat session for the user (tolerate DB errors)
-    active_session = None
-    try:
-        active_session = (
-            db.query(models.ChatSession)
-            .filter(models.ChatSession.user_id == current_user.id)
-            .filter(models.ChatSession.ended_at.is_(None))
-            .first()
-        )
-        if not active_session:
-            active_session = crud.chat_session.create_with_user(db=db, obj_in=schemas.ChatSessionCreate(), user_id=current_user.id)
-    except Exception:
-        active_session = None
-
-    # Save the user's message (best-effort)
-    try:
-        if active_session:
-            crud.chat_message.create_for_session(
-                db,
-                session_id=active_session.id,
-                user_id=current_user.id,
-                role="user",
-                content=message.content,
-            )
-    except Exception:
-        pass
+    context, session_id = await get_chat_context(db, current_user)
+    history = await get_history(db, session_id)
+    context.update(conversation_summary=history["summary"], recent_messages=history["messages"])
+    session_id = await _start_turn(db, history, current_user, message.content, session_id)
 
     # Try to respond quickly; fallback to quick tip on timeout/errors
     import asyncio
@@ -119,42 +100,88 @@ async def ask_assignwell(
     except Exception:
         response_content = ai_service.quick_tip(context)
 
-    # Save the assistant's message (best-effort)
-    try:
-        if active_session:
-            crud.chat_message.create_for_session(
-                db,
-                session_id=active_session.id,
-                user_id=current_user.id,
-                role="assistant",
-                content=response_content,
-            )
-    except Exception:
-        pass
+    await _save_reply(db, history, session_id, current_user.id, response_content)
 
     return {"role": "assistant", "content": response_content}
 
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+@router.post("/ask/stream", dependencies=[Depends(deps.rate_limit("chat_ask"))])
+async def ask_assignwell_stream(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    message: schemas.ChatMessage,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Streaming variant of /ask as server-sent events: a `token` event per text delta
+    ({"delta": ...}), then one `done` event with the full reply and time to first token.
+    The reply is saved to the chat session once the stream completes. If the upstream
+    fails partway, an `error` event ({"truncated": true}) ends the stream instead and the
+    partial reply is not saved.
+    """
+    from app.services.ai_service import ai_service
+
+    context, session_id = await get_chat_context(db, current_user)
+    history = await get_history(db, session_id)
+    context.update(conversation_summary=history["summary"], recent_messages=history["messages"])
+    session_id = await _start_turn(db, history, current_user, message.content, session_id)
+    user_id = current_user.id
+
+    async def events() -> AsyncIterator[bytes]:
+        parts: List[str] = []
+        ttft = None
+        started = time.perf_counter()  # the LLM call is issued from here on
+        try:
+            async for delta in ai_service.chat_response_stream(message.content, context):
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                    chat_ttft.observe(ttft)
+                parts.append(delta)
+                yield _sse("token", {"delta": delta})
+        except Exception as e:
+            logger.warning("Chat stream for session %s failed after %d deltas: %s", session_id, len(parts), e)
+            yield _sse("error", {"detail": "The reply was interrupted", "truncated": True})
+            return
+        content = "".join(parts).strip() or ai_service.quick_tip(context)
+        # The request's session may already be closed once streaming starts
+        async with AsyncSessionLocal() as save_db:
+            await _save_reply(save_db, history, session_id, user_id, content)
+        yield _sse("done", {"role": "assistant", "content": content, "ttft_ms": round((ttft or 0) * 1000, 1)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/sessions", response_model=List[schemas.ChatSession])
 def read_chat_sessions(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Retrieve chat sessions.
     """
-    sessions = crud.chat_session.get_multi_by_user(db=db, user_id=current_user.id, skip=skip, limit=limit)
-    return sessions
+    sessions = crud.chat_session.get_multi_by_user(db=db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, sessions, limit, CHAT_SESSION_KEYSET)
+    return json_list(schemas.ChatSession, sessions, response)
 
 
 @router.get("/sessions/{session_id}/messages", response_model=List[schemas.ChatMessage])
 def read_chat_session_messages(
     *,
+    response: Response,
     db: Session = Depends(deps.get_db),
     session_id: int,
     skip: int = 0,
     limit: int = 500,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -163,9 +190,9 @@ def read_chat_session_messages(
     session = crud.chat_session.get(db, id=session_id)
     if not session or session.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Session not found")
-    messages = crud.chat_message.get_messages_by_session(db=db, session_id=session_id, skip=skip, limit=limit)
-    # Map ORM to simple schema dicts
-    return [{"role": m.role, "content": m.content} for m in messages]
+    messages = crud.chat_message.get_messages_by_session(db=db, session_id=session_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, messages, limit, CHAT_MESSAGE_KEYSET)
+    return json_list(schemas.ChatMessage, messages, response)
 
 
 @router.post("/sessions/{session_id}/end")
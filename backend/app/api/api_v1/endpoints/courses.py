@@ -1,22 +1,27 @@
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.api import deps
 from app.crud import crud_assignment as asg
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Course])
 def read_courses(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
-    courses = asg.get_courses(db, user_id=current_user.id, skip=skip, limit=limit)
-    return courses
+    courses = asg.get_courses(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, courses, limit, asg.COURSE_KEYSET)
+    return json_list(schemas.Course, courses, response)
 
 @router.post("/", response_model=schemas.Course)
 def create_course(
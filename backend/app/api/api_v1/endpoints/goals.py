@@ -1,12 +1,14 @@
-from typing import Any, List, Tuple
+from typing import Any, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 from app import models, schemas
 from app.crud import crud_goal, crud_schedule
 from app.api import deps
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
 from app.models.schedule import BlockType, BlockStatus, BlockSource, ScheduleBlock
 from app.services.ai_service import ai_service
 
@@ -14,13 +16,17 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.GoalOut])
 def read_goals(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
+    _: None = Depends(deps.etag("goals")),
 ) -> Any:
-    goals = crud_goal.get_goals(db, user_id=current_user.id, skip=skip, limit=limit)
-    return goals
+    goals = crud_goal.get_goals(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, goals, limit, crud_goal.GOAL_KEYSET)
+    return json_list(schemas.GoalOut, goals, response)
 
 @router.post("/", response_model=schemas.GoalOut)
 def create_goal(
@@ -197,7 +203,7 @@ def _compute_candidate_slots(
 @router.post("/{goal_id}/suggest-times", response_model=schemas.SuggestTimesResponse)
 async def suggest_times(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     goal_id: int,
     request: schemas.SuggestTimesRequest,
     current_user: models.User = Depends(deps.get_current_user),
@@ -208,7 +214,7 @@ async def suggest_times(
     Returns either Case A (suggestions) or Case B (no good slots).
     """
     # Verify goal exists and belongs to current user
-    goal = crud_goal.get_goal(db, goal_id=goal_id, user_id=current_user.id)
+    goal = await crud_goal.get_goal_async(db, goal_id=goal_id, user_id=current_user.id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     
@@ -234,14 +240,9 @@ async def suggest_times(
     end_of_day = end_of_day_local.astimezone(timezone.utc)
     
     # Query schedule blocks for the day
-    existing_blocks = db.query(ScheduleBlock).filter(
-        and_(
-            ScheduleBlock.user_id == current_user.id,
-            ScheduleBlock.start_at >= start_of_day,
-            ScheduleBlock.start_at < end_of_day,
-            ScheduleBlock.status != BlockStatus.CANCELED
-        )
-    ).order_by(ScheduleBlock.start_at).all()
+    existing_blocks = await crud_schedule.get_active_blocks_between_async(
+        db, user_id=current_user.id, start=start_of_day, end=end_of_day
+    )
     
     # Step 1: Compute candidate slots using rule-based logic
     candidate_slots = _compute_candidate_slots(
@@ -1,24 +1,30 @@
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.api import deps
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Intervention])
 def read_interventions(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
+    _: None = Depends(deps.etag("interventions", per_user=False)),
 ) -> Any:
     """
     Retrieve interventions.
     """
-    interventions = crud.intervention.get_multi(db, skip=skip, limit=limit)
-    return interventions
+    interventions = crud.intervention.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, interventions, limit, (models.Intervention.id,))
+    return json_list(schemas.Intervention, interventions, response)
 
 @router.post("/session/start", response_model=schemas.InterventionSession)
 def start_intervention_session(
@@ -1,64 +1,58 @@
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.crud import crud_suggestion
 from app.api import deps
+from app.crud.crud_mood import MOOD_KEYSET
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
+from app.services import jobs
+
+SUGGESTIONS_STATUS_HEADER = "X-Suggestions-Status"
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.MoodCheckin])
 def read_mood_checkins(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retrieve mood check-ins.
+    Retrieve mood check-ins, newest first. Pass the X-Next-Cursor header back as `cursor` for the next page.
     """
     # Assuming crud.mood_checkin exists or we use a generic one
     mood_checkins = crud.mood_checkin.get_multi_by_owner(
-        db=db, owner_id=current_user.id, skip=skip, limit=limit
+        db=db, owner_id=current_user.id, skip=skip, limit=limit, cursor=cursor
     )
-    return mood_checkins
+    set_next_cursor(response, mood_checkins, limit, MOOD_KEYSET)
+    return json_list(schemas.MoodCheckin, mood_checkins, response)
 
 @router.post("/", response_model=schemas.MoodCheckin)
 async def create_mood_checkin(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     mood_in: schemas.MoodCheckinCreate,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Create new mood check-in.
     """
-    mood_checkin = crud.mood_checkin.create_with_owner(db=db, obj_in=mood_in, owner_id=current_user.id)
-    from app.services.ai_service import ai_service
-    recent = crud.mood_checkin.get_multi_by_owner(db=db, owner_id=current_user.id, limit=7)
-    history_dicts = [
-        {
-            "mood_valence": m.mood_valence,
-            "energy_level": m.energy_level,
-            "stress_level": m.stress_level,
-            "sleep_hours_last_night": m.sleep_hours_last_night,
-            "additional_metrics": m.additional_metrics,
-            "created_at": m.created_at,
-        }
-        for m in recent
-    ]
-    sleep_hrs_7 = float(sum([(m.sleep_hours_last_night or 0.0) for m in recent]))
-    activity = {"sleep_hrs_7": sleep_hrs_7, "checkins_7": len(recent)}
-    items = await ai_service.wellbeing_suggestions(history_dicts, activity)
-    create_items = [schemas.WellbeingSuggestionCreate(title=i["title"], description=i["description"], category=i["category"]) for i in items]
-    crud_suggestion.create_many(db, user_id=current_user.id, items=create_items, mood_checkin_id=mood_checkin.id)
+    mood_checkin = await crud.mood_checkin.create_with_owner_async(db=db, obj_in=mood_in, owner_id=current_user.id)
+    # Suggestions are generated in the background; GET /mood/suggestions reports progress
+    jobs.enqueue_wellbeing_suggestions(current_user.id, mood_checkin.id)
     return mood_checkin
 
-@router.post("/analyze", response_model=schemas.MoodInsight)
+@router.post("/analyze", response_model=schemas.MoodInsight, dependencies=[Depends(deps.rate_limit("mood_analyze"))])
 async def analyze_mood(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -68,7 +62,7 @@ async def analyze_mood(
     from app.services.ai_service import ai_service
     
     # Retrieve recent mood logs
-    mood_history = crud.mood_checkin.get_multi_by_owner(
+    mood_history = await crud.mood_checkin.get_multi_by_owner_async(
         db=db, owner_id=current_user.id, limit=5
     )
     # Convert to dict for service
@@ -97,32 +91,30 @@ async def infer_metrics(
     result = await ai_service.infer_mood_metrics(payload)
     return result
 
-@router.get("/suggestions", response_model=List[schemas.WellbeingSuggestion])
+@router.get(
+    "/suggestions",
+    response_model=List[schemas.WellbeingSuggestion],
+    responses={202: {"description": "Nothing stored yet; generation is pending"}},
+)
 async def wellbeing_suggestions(
     *,
-    db: Session = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
-    from app.services.ai_service import ai_service
-    
-    stored = crud_suggestion.latest_for_user(db, user_id=current_user.id)
-    if stored:
-        return [schemas.WellbeingSuggestion.from_orm(s) for s in stored]
-    mood_logs = crud.mood_checkin.get_multi_by_owner(db=db, owner_id=current_user.id, limit=7)
-    history_dicts = [
-        {
-            "mood_valence": m.mood_valence,
-            "energy_level": m.energy_level,
-            "stress_level": m.stress_level,
-            "sleep_hours_last_night": m.sleep_hours_last_night,
-            "additional_metrics": m.additional_metrics,
-            "created_at": m.created_at,
-        }
-        for m in mood_logs
-    ]
-    sleep_hrs_7 = float(sum([(m.sleep_hours_last_night or 0.0) for m in mood_logs]))
-    activity = {"sleep_hrs_7": sleep_hrs_7, "checkins_7": len(mood_logs)}
-    items = await ai_service.wellbeing_suggestions(history_dicts, activity)
-    create_items = [schemas.WellbeingSuggestionCreate(title=i["title"], description=i["description"], category=i["category"]) for i in items]
-    created = crud_suggestion.create_many(db, user_id=current_user.id, items=create_items)
-    return [schemas.WellbeingSuggestion.from_orm(s) for s in created]
+    """
+    Latest stored suggestions. X-Suggestions-Status is "pending" while a newer set is
+    being generated, else "ready". With nothing stored yet, generation is started and
+    an empty list is returned with 202 and Retry-After.
+    """
+    pending = jobs.suggestions_pending(current_user.id)
+    stored = await crud_suggestion.latest_for_user_async(db, user_id=current_user.id)
+    if not stored:
+        if not pending:
+            jobs.enqueue_wellbeing_suggestions(current_user.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers[SUGGESTIONS_STATUS_HEADER] = "pending"
+        response.headers["Retry-After"] = "2"
+        return []
+    response.headers[SUGGESTIONS_STATUS_HEADER] = "pending" if pending else "ready"
+    return [schemas.WellbeingSuggestion.from_orm(s) for s in stored]
@@ -1,30 +1,36 @@
 
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.crud.crud_peer_group import GROUP_MESSAGE_KEYSET, MEMBER_KEYSET
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
 from sqlalchemy import func
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.PeerGroup])
 def read_peer_groups(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Retrieve peer groups.
     """
-    groups = crud.peer_group.get_multi(db, skip=skip, limit=limit)
+    groups = crud.peer_group.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, groups, limit, (models.PeerGroup.id,))
     for group in groups:
         group.member_count = len(group.members)
         group.is_member = crud.peer_group.is_member(db=db, group_id=group.id, user_id=current_user.id)
-    return groups
+    return json_list(schemas.PeerGroup, groups, response)
 
 @router.get("/{group_id}", response_model=schemas.PeerGroup)
 def read_peer_group(
@@ -93,10 +99,12 @@ def leave_peer_group(
 @router.get("/{group_id}/members", response_model=List[schemas.GroupMember])
 def read_members(
     *,
+    response: Response,
     db: Session = Depends(deps.get_db),
     group_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     group = crud.peer_group.get(db=db, id=group_id)
@@ -104,8 +112,9 @@ def read_members(
         raise HTTPException(status_code=404, detail="Group not found")
     if not crud.peer_group.is_member(db=db, group_id=group_id, user_id=current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this group")
-    members = crud.peer_group.get_members(db=db, group_id=group_id, skip=skip, limit=limit)
-    return members
+    members = crud.peer_group.get_members(db=db, group_id=group_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, members, limit, MEMBER_KEYSET)
+    return json_list(schemas.GroupMember, members, response)
 
 @router.get("/recommendations", response_model=List[schemas.PeerGroup])
 def recommend_peer_groups(
@@ -165,10 +174,12 @@ def nudge_group(
 @router.get("/{group_id}/messages", response_model=List[schemas.GroupMessage])
 def read_messages(
     *,
+    response: Response,
     db: Session = Depends(deps.get_db),
     group_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -177,8 +188,9 @@ def read_messages(
     if not crud.peer_group.is_member(db=db, group_id=group_id, user_id=current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this group")
         
-    messages = crud.peer_group.get_messages(db=db, group_id=group_id, skip=skip, limit=limit)
-    return messages
+    messages = crud.peer_group.get_messages(db=db, group_id=group_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, messages, limit, GROUP_MESSAGE_KEYSET)
+    return json_list(schemas.GroupMessage, messages, response)
 
 @router.post("/{group_id}/messages", response_model=schemas.GroupMessage)
 def create_message(
@@ -1,22 +1,28 @@
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.crud import crud_schedule as schedule_crud
 from app.api import deps
+from app.api.responses import json_list
+from app.crud.pagination import set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.ScheduleBlock])
 def read_schedule(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user),
+    _: None = Depends(deps.etag("schedule")),
 ) -> Any:
-    schedule = schedule_crud.get_schedule_blocks(db, user_id=current_user.id, skip=skip, limit=limit)
-    return schedule
+    schedule = schedule_crud.get_schedule_blocks(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, schedule, limit, schedule_crud.SCHEDULE_KEYSET)
+    return json_list(schemas.ScheduleBlock, schedule, response)
 
 @router.post("/", response_model=schemas.ScheduleBlock)
 def create_schedule_block(
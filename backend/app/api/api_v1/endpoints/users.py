@@ -118,6 +118,7 @@ def deactivate_account(
     current_user.is_active = False
     db.add(current_user)
     db.commit()
+    crud.crud_user.invalidate_cached_user(current_user.id)
     db.refresh(current_user)
     return {"status": "deactivated"}
 
@@ -128,8 +129,10 @@ def delete_account(
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     try:
+        user_id = current_user.id
         db.delete(current_user)
         db.commit()
+        crud.crud_user.invalidate_cached_user(user_id)
         return {"status": "deleted"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -138,6 +141,7 @@ def delete_account(
 def read_user_settings(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
+    _: None = Depends(deps.etag("settings")),
 ) -> Any:
     """
     Get current user settings.
@@ -1,15 +1,19 @@
 
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+import hashlib
+from typing import AsyncGenerator, Callable, Generator, Optional
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.cache import cache, resource_version
 from app.core.config import settings
 from app.core import security
+from app.core.rate_limit import client_ip, retry_after
 from app.crud import crud_user
 from app.models.user import User
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.schemas.token import TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -24,6 +28,10 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def get_current_user(
     db: Session = Depends(get_db),
     token: Optional[str] = Depends(reusable_oauth2)
@@ -35,9 +43,77 @@ def get_current_user(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         token_data = TokenPayload(**payload)
-        user = crud_user.get_user(db, user_id=token_data.sub)
+        user = crud_user.get_user_cached(db, user_id=token_data.sub)
         if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
         return user
     except (JWTError, ValidationError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+def etag(resource: str, *, per_user: bool = True) -> Callable[..., None]:
+    """
+    Dependency for conditional GETs on a versioned resource (see app.core.cache.bump_version).
+    The ETag is derived from the resource version and the query string, so it is checked
+    before the endpoint queries anything; a matching If-None-Match returns 304 right away.
+    Off unless versions are shared by all workers (settings.ETAG_ENABLED).
+    """
+    def check_etag(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user),
+    ) -> None:
+        if not (cache.shared if settings.ETAG_ENABLED is None else settings.ETAG_ENABLED):
+            return
+        version = resource_version(resource, current_user.id if per_user else None)
+        if version is None:
+            return
+        query = hashlib.blake2b(request.url.query.encode(), digest_size=4).hexdigest()
+        tag = f'W/"{version}-{query}"'
+        headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if tag in (t.strip() for t in if_none_match.split(",")):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return check_etag
+
+def _client_ip(request: Request) -> str:
+    return client_ip(request.client.host if request.client else None, request.headers.get("x-forwarded-for"))
+
+def _enforce_rate_limit(request: Request, route: str, key: str) -> None:
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    # The per-IP backstop first, so a request it rejects costs the user or account nothing
+    wait = retry_after("ip", _client_ip(request), settings.RATE_LIMIT_PER_IP)
+    if not wait:
+        wait = retry_after(route, key, settings.RATE_LIMITS[route])
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please retry later",
+            headers={"Retry-After": str(wait)},
+        )
+
+def rate_limit(route: str) -> Callable[..., None]:
+    """
+    Dependency applying settings.RATE_LIMITS[route] to the current user, plus the
+    per-IP backstop. Over the limit it answers 429 with Retry-After.
+    """
+    def check_rate_limit(
+        request: Request,
+        current_user: User = Depends(get_current_user),
+    ) -> None:
+        _enforce_rate_limit(request, route, f"user:{current_user.id}")
+
+    return check_rate_limit
+
+def login_rate_limit(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+) -> None:
+    """
+    Login attempts are limited per (account name, client address), so bad attempts from
+    elsewhere cannot lock the owner out of their account.
+    """
+    _enforce_rate_limit(request, "login", f"email:{form_data.username.lower()}:{_client_ip(request)}")
@@ -0,0 +1,53 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for List[schema], built (and its validator/serializer compiled) once per schema."""
+    return TypeAdapter(List[schema])
+
+
+@lru_cache(maxsize=None)
+def _field_names(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def _row_data(row: Any, names: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Pull the schema's fields off an ORM row. Loaded columns are read straight from the
+    instance dict, skipping the instrumented-attribute descriptor that from_attributes
+    validation would otherwise go through per field; anything not loaded yet
+    (relationships, expired columns) falls back to getattr so it loads as before.
+    """
+    if isinstance(row, dict):
+        return row
+    loaded = row.__dict__
+    data = {}
+    for name in names:
+        value = loaded[name] if name in loaded else getattr(row, name, _MISSING)
+        if value is not _MISSING:
+            data[name] = value
+    return data
+
+
+def json_list(schema: Type[BaseModel], rows: Sequence[Any], response: Optional[Response] = None) -> Response:
+    """
+    Validate and serialize a list of ORM rows (or dicts) with the cached adapter for
+    `schema`, straight to JSON bytes. Headers already set on the endpoint's injected
+    `response` (e.g. X-Next-Cursor) are carried over, since FastAPI does not merge
+    them into a Response returned directly. Keep `response_model` on the route for the
+    OpenAPI schema.
+    """
+    adapter = list_adapter(schema)
+    names = _field_names(schema)
+    items = adapter.validate_python([_row_data(row, names) for row in rows], from_attributes=True)
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(content=adapter.dump_json(items), media_type="application/json", headers=headers)
@@ -0,0 +1,170 @@
+import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Scope = Union[int, str, None]
+
+
+class MemoryCache:
+    """
+    Process-local TTL + LRU cache. Only coherent within one worker process;
+    configure REDIS_URL when running several.
+    """
+
+    shared = False
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set only if absent (or expired); True if this call stored the value."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and (item[0] is None or item[0] > time.monotonic()):
+                return False
+        self.set(key, value, ttl)
+        return True
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """
+    Redis-backed cache shared by all workers. Values are pickled. Redis errors are
+    logged and treated as misses, so an outage degrades to uncached behaviour.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "assignwell:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.prefix = prefix
+        self._errors = (redis.RedisError,)
+
+    def _ttl_ms(self, ttl: Optional[float]) -> Optional[int]:
+        return max(int(ttl * 1000), 1) if ttl else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except self._errors as e:
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return default
+        return default if raw is None else pickle.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            self.client.set(self.prefix + key, pickle.dumps(value), px=self._ttl_ms(ttl))
+        except self._errors as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        try:
+            return bool(self.client.set(self.prefix + key, pickle.dumps(value), px=self._ttl_ms(ttl), nx=True))
+        except self._errors as e:
+            logger.warning("Cache add failed for %s: %s", key, e)
+            return False
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self.client.delete(*(self.prefix + key for key in keys))
+        except self._errors as e:
+            logger.warning("Cache delete failed for %s: %s", keys, e)
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except self._errors as e:
+            logger.warning("Cache clear failed: %s", e)
+
+
+def _build_cache():
+    if settings.REDIS_URL:
+        return RedisCache(settings.REDIS_URL)
+    return MemoryCache(maxsize=settings.CACHE_MAX_ENTRIES)
+
+
+cache = _build_cache()
+
+
+# Resource versions: an opaque token per (resource, user) that changes on every write.
+# Tokens are random rather than counters, so a version evicted from the cache can never
+# come back with a value a client has already seen.
+VERSION_TTL = 7 * 24 * 3600
+
+
+def _version_key(resource: str, scope: Scope) -> str:
+    return f"version:{resource}:{'*' if scope is None else scope}"
+
+
+def resource_version(resource: str, scope: Scope = None) -> Optional[str]:
+    """Current version token of `resource` for `scope` (a user id, or None for global data)."""
+    key = _version_key(resource, scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex[:16], ttl=VERSION_TTL)
+        version = cache.get(key)
+    return version
+
+
+# Cached views built from several resources: view name -> the resources it reads. A
+# bump of any source drops the view for that scope, so reading it is one cache get
+# rather than a version check per source.
+DERIVED_VIEWS: Dict[str, Tuple[str, ...]] = {
+    "chat_context": ("assignments", "mood"),
+}
+
+
+def view_key(view: str, scope: Scope) -> str:
+    return f"view:{view}:{'*' if scope is None else scope}"
+
+
+def bump_version(resource: str, scope: Scope = None) -> None:
+    """Call after a write to `resource` has committed."""
+    cache.set(_version_key(resource, scope), uuid.uuid4().hex[:16], ttl=VERSION_TTL)
+    stale = [view_key(view, scope) for view, sources in DERIVED_VIEWS.items() if resource in sources]
+    if stale:
+        cache.delete(*stale)
@@ -1,6 +1,6 @@
 
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import Dict, List, Literal, Optional, Tuple, Union
 from pathlib import Path
 
 class Settings(BaseSettings):
@@ -15,11 +15,105 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = "5432"
     SQLALCHEMY_DATABASE_URI: Union[str, None] = None
     DATABASE_URL: Union[str, None] = None
+    # Derived from SQLALCHEMY_DATABASE_URI (asyncpg / aiosqlite) unless set explicitly
+    SQLALCHEMY_ASYNC_DATABASE_URI: Union[str, None] = None
+
+    # Connection pool (applies to both the sync and async engines, per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables recycling
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_POOL_PRE_PING_IDLE_SECONDS: int = 30  # "idle" mode: only ping connections idle this long
+
+    # Per-request SQL instrumentation (Server-Timing header, slow / N+1 logging)
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_SLOW_REQUEST_MS: int = 200  # log requests whose total DB time exceeds this
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # log statement shapes repeated this often in one request
+
+    # Shared cache / resource version store. Without REDIS_URL an in-process cache is
+    # used, which is only coherent with a single worker process.
+    REDIS_URL: Union[str, None] = None
+    CACHE_MAX_ENTRIES: int = 10000  # in-process cache size (LRU)
+
+    # Seconds get_current_user may serve a user from the cache instead of the database
+    # (0 disables). Writes invalidate it; with several workers and no REDIS_URL this is
+    # also the longest another worker can see a stale row.
+    USER_CACHE_TTL: int = 60
+
+    # Seconds a user's chat context snapshot (upcoming assignments, recent moods) may be
+    # reused. Writes to those drop it, but only in the cache of the worker that made them,
+    # so without REDIS_URL the snapshot is kept for CHAT_CONTEXT_LOCAL_TTL instead (0 loads
+    # it every turn). The TTL bounds staleness from any write that bypasses the CRUD layer.
+    CHAT_CONTEXT_TTL: int = 600
+    CHAT_CONTEXT_LOCAL_TTL: int = 0
+
+    # Write-behind for chat messages: queue them in the worker and bulk-insert every
+    # interval instead of committing each on the request path. Queued messages are lost
+    # if the process is killed without a clean shutdown; when the queue is full, messages
+    # are written directly.
+    CHAT_WRITE_BEHIND: bool = False
+    CHAT_WRITE_BEHIND_INTERVAL_MS: int = 200
+    CHAT_WRITE_BEHIND_MAX_BATCH: int = 500
+    CHAT_WRITE_BEHIND_MAX_PENDING: int = 10000
+
+    # Chat prompt history: the session's rolling summary plus the messages after it. Once
+    # CHAT_HISTORY_MESSAGES + 2 * CHAT_SUMMARY_EVERY_TURNS messages are unsummarized, a
+    # background job folds all but the last CHAT_HISTORY_MESSAGES into the summary.
+    CHAT_HISTORY_MESSAGES: int = 6
+    CHAT_SUMMARY_EVERY_TURNS: int = 5
+    CHAT_HISTORY_MESSAGE_CHARS: int = 1000  # per message in the prompt
+    # Seconds the history window may be served from the cache. Only used with REDIS_URL;
+    # a per-process cache would miss messages saved by other workers.
+    CHAT_HISTORY_TTL: int = 120
+    CHAT_SUMMARY_MAX_TOKENS: int = 250
+
+    # Token-bucket rate limits ("<count>/<second|minute|hour|day>"). RATE_LIMITS apply per
+    # user (per account name and client address for login); RATE_LIMIT_PER_IP is a backstop
+    # per client address across all limited routes, kept loose because campus networks
+    # share NAT addresses. Buckets are per process unless REDIS_URL is set. An env override
+    # of RATE_LIMITS only needs the routes it changes.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: Dict[str, str] = {
+        "login": "10/minute",
+        "ai_replan_week": "6/minute",
+        "mood_analyze": "10/minute",
+        "chat_ask": "30/minute",
+    }
+    RATE_LIMIT_PER_IP: str = "300/minute"
+    # Reverse proxies (addresses or CIDR ranges) whose X-Forwarded-For names the client for
+    # the limits above; without any, the connecting address is the client.
+    RATE_LIMIT_TRUSTED_PROXIES: List[str] = []
+
+    # Background jobs (wellbeing suggestions after a mood check-in): "inprocess" runs them
+    # on the API's event loop, "celery" hands them to `celery -A app.worker worker` and
+    # needs REDIS_URL, since the API and the worker share the job status markers.
+    JOBS_BACKEND: Literal["inprocess", "celery"] = "inprocess"
+    CELERY_BROKER_URL: Union[str, None] = None  # defaults to REDIS_URL
+    JOBS_INPROCESS_WORKERS: int = 2
+    JOBS_INPROCESS_MAX_QUEUE: int = 1000
+    SUGGESTIONS_PENDING_TTL: int = 300  # seconds a generation is reported pending at most
+
+    # ETag / If-None-Match on read-mostly GET endpoints. The ETag is a resource version
+    # kept in the shared cache, so by default it is only on with REDIS_URL: with the
+    # in-process cache another worker's write would not change it and clients would get
+    # 304s for stale data. Set True to force it on for a single-worker deployment.
+    ETAG_ENABLED: Optional[bool] = None
+
+    # Response compression (brotli is used when the `brotli` package is installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11
 
     # Auth
     SECRET_KEY: str = "YOUR_SECRET_KEY" # TODO: Change in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # pbkdf2_sha256 cost. Stored hashes with a different round count are re-hashed on
+    # the next successful login, so this can be raised (or lowered) at any time.
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 0  # threads reserved for hashing; 0 = one per CPU
     
     
     # CORS
@@ -29,6 +123,71 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Union[str, None] = None  # Set this in .env to enable real AI features
     OPENAI_MODEL: str = "gpt-4o-mini"  # Can be changed to gpt-4, gpt-3.5-turbo, etc.
     OPENAI_FAST_MODEL: str = "gpt-4o-mini"  # Faster, lower-cost model for chat
+    OPENAI_BASE_URL: Optional[str] = None  # e.g. http://localhost:9100/v1 for scripts/fake_openai_server.py
+    # HTTP transport shared by all OpenAI calls in a worker. Keep OPENAI_MAX_CONNECTIONS at
+    # least the total LLM_CONCURRENCY so scheduler slots never wait on the pool; HTTP/2 is
+    # used when the h2 package is installed. The read timeout is per socket read, the
+    # breaker's adaptive timeout bounds each call as a whole.
+    OPENAI_MAX_CONNECTIONS: int = 64
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 32
+    OPENAI_KEEPALIVE_EXPIRY: float = 120.0
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_READ_TIMEOUT: float = 60.0
+    OPENAI_HTTP2: bool = True
+    OPENAI_WARMUP_CONNECTIONS: int = 2  # opened at startup
+    # "fake" answers every AIService call in-process with FakeLLM (app/services/llm_backends.py)
+    LLM_BACKEND: Literal["openai", "fake"] = "openai"
+    # FakeLLM: time to first token ("fixed:S", "uniform:A,B" or "lognormal:MEDIAN,SIGMA"
+    # seconds), delay per streamed token, injected 500/429/hang rates, RNG seed for
+    # latency and errors, and a cassette of recorded replies to serve first.
+    FAKE_LLM_LATENCY: str = "lognormal:0.6,0.4"
+    FAKE_LLM_TOKEN_DELAY_MS: float = 15.0
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_RATE_LIMIT_RATE: float = 0.0
+    FAKE_LLM_HANG_RATE: float = 0.0
+    FAKE_LLM_SEED: Optional[int] = None
+    FAKE_LLM_CASSETTE: Optional[str] = None
+    # Completion cache: AIService methods listed here (name -> TTL seconds) reuse the reply
+    # for identical inputs. "shared" stores replies in Redis (REDIS_URL) for all workers.
+    LLM_CACHE_TTLS: Dict[str, int] = {
+        "extract_assignment_text": 7 * 24 * 3600,
+        "generate_assignment_plan": 24 * 3600,
+        "analyze_mood": 3600,
+        "generate_busy_day_message": 24 * 3600,
+    }
+    LLM_CACHE_BACKEND: Literal["memory", "shared"] = "memory"
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    # USD per million (prompt, completion) tokens, for the cost estimates on /metrics
+    LLM_PRICES: Dict[str, Tuple[float, float]] = {
+        "gpt-4o-mini": (0.15, 0.60),
+        "gpt-4o": (2.50, 10.00),
+        "gpt-4.1-mini": (0.40, 1.60),
+        "gpt-3.5-turbo": (0.50, 1.50),
+    }
+    # LLM scheduler (per worker): concurrent requests per model, slots kept free of
+    # background calls (suggestions, summaries), and queue depth per priority class
+    # beyond which calls fail fast to their fallback (an override needs only the classes
+    # it changes).
+    LLM_DEFAULT_CONCURRENCY: int = 8
+    LLM_CONCURRENCY: Dict[str, int] = {}
+    LLM_RESERVED_SLOTS: int = 2
+    LLM_MAX_QUEUED: Dict[str, int] = {"chat": 100, "interactive": 100, "suggestions": 20, "summaries": 20}
+    CHAT_STREAM_MAX_TOKENS: int = 400  # /chat/ask/stream is not bound by the 2 s budget of /chat/ask
+    # Circuit breaker per (model, method): opens once at least LLM_BREAKER_MIN_CALLS calls
+    # in the window failed at LLM_BREAKER_ERROR_RATE or more, then lets one probe through
+    # after the cooldown. Callers get their fallback immediately while it is open.
+    LLM_BREAKER_WINDOW_SECONDS: int = 60
+    LLM_BREAKER_MIN_CALLS: int = 10
+    LLM_BREAKER_ERROR_RATE: float = 0.5
+    LLM_BREAKER_COOLDOWN_SECONDS: int = 30
+    # Per-call timeout: observed p95 x multiplier, clamped to [floor, ceiling]; the default
+    # applies until LLM_TIMEOUT_MIN_SAMPLES successes are seen. Ceilings per method override.
+    LLM_TIMEOUT_DEFAULT: float = 20.0
+    LLM_TIMEOUT_MIN_SAMPLES: int = 20
+    LLM_TIMEOUT_P95_MULTIPLIER: float = 2.0
+    LLM_TIMEOUT_FLOOR: float = 1.0
+    LLM_TIMEOUT_CEILING: float = 30.0
+    LLM_TIMEOUT_CEILINGS: Dict[str, float] = {"chat_response": 2.0}
 
     class Config:
         case_sensitive = True
@@ -46,5 +205,24 @@ class Settings(BaseSettings):
                 )
             else:
                 raise ValueError("SQLALCHEMY_DATABASE_URI is not configured. Set DATABASE_URL or POSTGRES_* in .env")
+        if not self.SQLALCHEMY_ASYNC_DATABASE_URI:
+            self.SQLALCHEMY_ASYNC_DATABASE_URI = _to_async_uri(self.SQLALCHEMY_DATABASE_URI)
+        if self.JOBS_BACKEND == "celery" and not self.REDIS_URL:
+            # Without a shared cache the worker could not clear the API's "pending" markers
+            raise ValueError("JOBS_BACKEND=celery needs REDIS_URL for the cache shared with the worker")
+        # An env override replaces a dict setting; keep the defaults for keys it leaves out
+        for name in ("RATE_LIMITS", "LLM_MAX_QUEUED"):
+            setattr(self, name, {**type(self).model_fields[name].default, **getattr(self, name)})
+
+
+def _to_async_uri(uri: str) -> str:
+    """Swap the sync DBAPI driver in a database URI for its asyncio counterpart."""
+    scheme, sep, rest = uri.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return uri
 
 settings = Settings()
@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+
+class LatencyStats:
+    """
+    Thread-safe latency recorder.
+    Keeps lifetime count/total/max plus a sliding window of recent samples for percentiles.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        return percentile(samples, q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, max_ = self.count, self.total, self.max
+        return {
+            "count": count,
+            "avg_ms": round(total / count * 1000, 3) if count else 0.0,
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+            "max_ms": round(max_ * 1000, 3),
+        }
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..1) of already sorted samples; 0.0 when empty."""
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))]
+
+
+class _Timer:
+    def __init__(self, stats: LatencyStats):
+        self.stats = stats
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stats.observe(time.perf_counter() - self.start)
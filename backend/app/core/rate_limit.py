@@ -0,0 +1,142 @@
+import ipaddress
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+from app.core.cache import RedisCache, cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_limit(limit: str) -> Tuple[float, float]:
+    """'10/minute' -> (capacity 10, refill 10/60 tokens per second)."""
+    count, _, period = limit.partition("/")
+    seconds = _PERIODS[period.strip().rstrip("s")]
+    capacity = float(count)
+    return capacity, capacity / seconds
+
+
+class MemoryBucketStore:
+    """Token buckets in this process; each worker enforces the limits on its own."""
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        """Take `cost` tokens; returns 0 on success, else seconds until they are available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+# Same algorithm as MemoryBucketStore.take, atomically on the server using Redis' clock
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """
+    Token buckets shared by all workers. If Redis is unreachable requests are let
+    through (and logged) rather than failing the endpoint.
+    """
+
+    def __init__(self, client, prefix: str = "assignwell:ratelimit:"):
+        import redis
+
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+        self._errors = (redis.RedisError,)
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        try:
+            return float(self._take(keys=[self.prefix + key], args=[capacity, rate, cost]))
+        except self._errors as e:
+            logger.warning("Rate limit check failed for %s: %s", key, e)
+            return 0.0
+
+
+def _build_store():
+    if isinstance(cache, RedisCache):
+        return RedisBucketStore(cache.client)
+    return MemoryBucketStore()
+
+
+store = _build_store()
+
+
+def retry_after(route: str, key: str, limit: str) -> int:
+    """
+    Charge one request for `key` against `limit` on `route`. Returns 0 if allowed,
+    otherwise the whole seconds to wait (for the Retry-After header).
+    """
+    capacity, rate = parse_limit(limit)
+    wait = store.take(f"{route}:{key}", capacity, rate)
+    return math.ceil(wait) if wait > 0 else 0
+
+
+@lru_cache(maxsize=None)
+def _networks(proxies: Tuple[str, ...]) -> Tuple[Union[ipaddress.IPv4Network, ipaddress.IPv6Network], ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _networks(tuple(settings.RATE_LIMIT_TRUSTED_PROXIES)))
+
+
+def client_ip(peer: Optional[str], forwarded_for: Optional[str]) -> str:
+    """
+    Client address for per-IP limits. Behind a trusted proxy (RATE_LIMIT_TRUSTED_PROXIES)
+    X-Forwarded-For is read from the right, past any further trusted proxies; the first
+    other address is the client. Anything left of it could have been set by the client.
+    """
+    address = peer or "unknown"
+    if not forwarded_for or not _is_trusted_proxy(address):
+        return address
+    for hop in reversed([hop.strip() for hop in forwarded_for.split(",") if hop.strip()]):
+        address = hop
+        if not _is_trusted_proxy(hop):
+            break
+    return address
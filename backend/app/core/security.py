@@ -1,11 +1,27 @@
-
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Union, Optional, Tuple
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# min == max rounds makes needs_update() flag any hash not at the configured cost
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
+
+# All hashing runs here. hashlib's PBKDF2 releases the GIL, so this scales across cores,
+# and the bounded pool keeps a login burst from occupying every request thread.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     if expires_delta:
@@ -18,7 +34,19 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     return encoded_jwt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _hash_executor.submit(pwd_context.verify, plain_password, hashed_password).result()
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(valid, new_hash); new_hash is set when the stored hash should be replaced."""
+    return _hash_executor.submit(pwd_context.verify_and_update, plain_password, hashed_password).result()
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _hash_executor.submit(pwd_context.hash, password).result()
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
@@ -1,9 +1,16 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import Column, delete, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.cache import Scope, bump_version
+from app.crud.pagination import paginate
 from app.db.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -11,7 +18,26 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+@contextmanager
+def _keep_loaded(db: Session) -> Iterator[None]:
+    """
+    Commit without expiring: rows that came back from RETURNING are already
+    complete, and expiring them would cost one SELECT per object on next access.
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        yield
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # ETag version (app.core.cache) bumped after every committed write through this object:
+    # per user (the row's user_id) or, with version_per_user = False, for everyone.
+    version_resource: Optional[str] = None
+    version_per_user: bool = True
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -26,10 +52,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
+    async def get_async(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return paginate(db.query(self.model), (self.model.id,), cursor=cursor, skip=skip, limit=limit).all()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
@@ -37,8 +66,38 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self._bump_versions(self._version_scopes([db_obj]))
         return db_obj
 
+    def _version_scopes(self, db_objs: Sequence[Any]) -> List[Scope]:
+        if self.version_resource is None:
+            return []
+        if not self.version_per_user:
+            return [None]
+        return list({getattr(obj, "user_id") for obj in db_objs})
+
+    def _bump_versions(self, scopes: Sequence[Scope]) -> None:
+        for scope in scopes:
+            bump_version(self.version_resource, scope)
+
+    @cached_property
+    def _columns(self) -> Dict[str, Column]:
+        """Attribute key -> mapped column, read once from the mapper."""
+        return {attr.key: attr.columns[0] for attr in inspect(self.model).column_attrs}
+
+    @cached_property
+    def _primary_key(self) -> Dict[str, Column]:
+        mapper = inspect(self.model)
+        return {mapper.get_property_by_column(column).key: column for column in mapper.primary_key}
+
+    @cached_property
+    def _onupdate_columns(self) -> Dict[str, Column]:
+        """Columns the database or SQLAlchemy fills in on UPDATE (e.g. updated_at)."""
+        return {
+            key: column for key, column in self._columns.items()
+            if column.onupdate is not None or column.server_onupdate is not None
+        }
+
     def update(
         self,
         db: Session,
@@ -46,21 +105,140 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
+        """
+        Apply only the columns whose value actually changes and read those, plus any
+        onupdate columns, back from UPDATE ... RETURNING instead of a commit followed by
+        a refresh SELECT. Other pending changes on db_obj are left alone and written by
+        the commit. Nothing changed means no write at all.
+        """
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        changes = {}
+        for field, value in update_data.items():
+            if field not in self._columns:
+                continue
+            current = getattr(db_obj, field)
+            # An in-place mutated JSON dict/list compares equal to itself, so write it anyway
+            if current is value and isinstance(value, (dict, list)) or current != value:
+                changes[field] = value
+        if not changes and not db.is_modified(db_obj):
+            return db_obj
+
+        if not changes or not db.get_bind().dialect.update_returning:
+            for field, value in changes.items():
+                setattr(db_obj, field, value)
+            db.add(db_obj)
+            db.commit()
+            db.refresh(db_obj)
+            self._bump_versions(self._version_scopes([db_obj]))
+            return db_obj
+
+        returned = {**{field: self._columns[field] for field in changes}, **self._onupdate_columns}
+        stmt = (
+            update(self.model)
+            .where(*[column == getattr(db_obj, key) for key, column in self._primary_key.items()])
+            .values({self._columns[field]: value for field, value in changes.items()})
+            .returning(*returned.values())
+            .execution_options(synchronize_session=False)
+        )
+        row = db.execute(stmt).one()
+        for key, value in zip(returned, row):
+            set_committed_value(db_obj, key, value)
+        with _keep_loaded(db):
+            db.commit()
+        self._bump_versions(self._version_scopes([db_obj]))
         return db_obj
 
+    def _bulk_rows(self, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        # Plain dicts (not jsonable_encoder) so datetimes/enums reach the driver as-is; schema
+        # defaults are included, as in create()
+        return [obj if isinstance(obj, dict) else obj.dict() for obj in objs_in]
+
+    def create_many(
+        self, db: Session, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """
+        Insert all rows in one transaction with INSERT ... RETURNING (batched into
+        multi-row statements where the dialect supports it), instead of an
+        add/commit/refresh round-trip per object.
+        """
+        rows = self._bulk_rows(objs_in)
+        if not rows:
+            return []
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        db_objs = list(db.scalars(stmt, rows))
+        with _keep_loaded(db):
+            db.commit()
+        self._bump_versions(self._version_scopes(db_objs))
+        return db_objs
+
+    async def create_many_async(
+        self, db: AsyncSession, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        rows = self._bulk_rows(objs_in)
+        if not rows:
+            return []
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        db_objs = list(await db.scalars(stmt, rows))
+        await db.commit()
+        self._bump_versions(self._version_scopes(db_objs))
+        return db_objs
+
+    def update_many(self, db: Session, *, objs_in: Sequence[Dict[str, Any]]) -> int:
+        """
+        Bulk UPDATE by primary key: each dict carries `id` plus the columns to set.
+        Runs as a single executemany; rows sharing the same set of keys are batched together.
+        """
+        if not objs_in:
+            return 0
+        scopes = self._scopes_for_ids(db, [obj["id"] for obj in objs_in])
+        db.execute(update(self.model), list(objs_in))
+        db.commit()
+        self._bump_versions(scopes)
+        return len(objs_in)
+
+    async def update_many_async(self, db: AsyncSession, *, objs_in: Sequence[Dict[str, Any]]) -> int:
+        if not objs_in:
+            return 0
+        scopes = await db.run_sync(self._scopes_for_ids, [obj["id"] for obj in objs_in])
+        await db.execute(update(self.model), list(objs_in))
+        await db.commit()
+        self._bump_versions(scopes)
+        return len(objs_in)
+
+    def delete_many(self, db: Session, *, ids: Sequence[Any]) -> int:
+        """
+        One DELETE ... WHERE id IN (...). ORM cascades do not run; dependent rows are left
+        to the foreign keys' ON DELETE rules, as with any bulk delete.
+        """
+        if not ids:
+            return 0
+        scopes = self._scopes_for_ids(db, ids)
+        result = db.execute(delete(self.model).where(self.model.id.in_(ids)))
+        db.commit()
+        self._bump_versions(scopes)
+        return result.rowcount
+
+    async def delete_many_async(self, db: AsyncSession, *, ids: Sequence[Any]) -> int:
+        if not ids:
+            return 0
+        scopes = await db.run_sync(self._scopes_for_ids, ids)
+        result = await db.execute(delete(self.model).where(self.model.id.in_(ids)))
+        await db.commit()
+        self._bump_versions(scopes)
+        return result.rowcount
+
+    def _scopes_for_ids(self, db: Session, ids: Sequence[Any]) -> List[Scope]:
+        if self.version_resource is None or not self.version_per_user:
+            return self._version_scopes([])
+        return list(db.scalars(select(self.model.user_id).where(self.model.id.in_(ids)).distinct()))
+
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
+        scopes = self._version_scopes([obj])
         db.delete(obj)
         db.commit()
+        self._bump_versions(scopes)
         return obj
@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.accountability import AccountabilityPair, PairNudge
 from app.schemas.accountability import AccountabilityPairCreate, PairNudgeCreate
+from app.crud.pagination import paginate
+
+NUDGE_KEYSET = (PairNudge.created_at, PairNudge.id)
 
 class CRUDAcctPair(CRUDBase[AccountabilityPair, AccountabilityPairCreate, AccountabilityPairCreate]):
     def create_for_user(self, db: Session, *, user_a_id: int, obj_in: AccountabilityPairCreate) -> AccountabilityPair:
@@ -23,8 +26,9 @@ class CRUDAcctNudge:
         db.refresh(db_obj)
         return db_obj
 
-    def get_by_pair(self, db: Session, *, pair_id: int, skip: int = 0, limit: int = 100) -> List[PairNudge]:
-        return db.query(PairNudge).filter(PairNudge.pair_id == pair_id).order_by(PairNudge.created_at.desc()).offset(skip).limit(limit).all()
+    def get_by_pair(self, db: Session, *, pair_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[PairNudge]:
+        query = db.query(PairNudge).filter(PairNudge.pair_id == pair_id)
+        return paginate(query, NUDGE_KEYSET, cursor=cursor, skip=skip, limit=limit, descending=True).all()
 
 acct_pair = CRUDAcctPair(AccountabilityPair)
 acct_nudge = CRUDAcctNudge()
\ No newline at end of file
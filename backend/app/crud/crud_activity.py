@@ -1,10 +1,13 @@
-from typing import List
+from typing import List, Optional
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
+from app.crud.pagination import paginate
 from app.models.activity import ActivitySession
 from app.schemas.activity import ActivitySessionCreate, ActivitySessionUpdate
 
+ACTIVITY_KEYSET = (ActivitySession.started_at, ActivitySession.id)
+
 class CRUDActivitySession(CRUDBase[ActivitySession, ActivitySessionCreate, ActivitySessionUpdate]):
     def create_with_user(self, db: Session, *, obj_in: ActivitySessionCreate, user_id: int) -> ActivitySession:
         obj_in_data = jsonable_encoder(obj_in)
@@ -14,14 +17,8 @@ class CRUDActivitySession(CRUDBase[ActivitySession, ActivitySessionCreate, Activ
         db.refresh(db_obj)
         return db_obj
 
-    def get_multi_by_user(self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100) -> List[ActivitySession]:
-        return (
-            db.query(self.model)
-            .filter(ActivitySession.user_id == user_id)
-            .order_by(self.model.started_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def get_multi_by_user(self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[ActivitySession]:
+        query = db.query(self.model).filter(ActivitySession.user_id == user_id)
+        return paginate(query, ACTIVITY_KEYSET, cursor=cursor, skip=skip, limit=limit, descending=True).all()
 
 activity_session = CRUDActivitySession(ActivitySession)
\ No newline at end of file
@@ -1,12 +1,20 @@
 
 from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.assignment import Assignment, Course, Subtask
 from app.schemas.assignment import AssignmentCreate, AssignmentUpdate, CourseCreate, CourseUpdate, SubtaskCreate, SubtaskUpdate
+from app.core.cache import bump_version
+from app.crud.pagination import paginate
+
+COURSE_KEYSET = (Course.created_at, Course.id)
+ASSIGNMENT_KEYSET = (Assignment.created_at, Assignment.id)
 
 # Course CRUD
-def get_courses(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Course).filter(Course.user_id == user_id).offset(skip).limit(limit).all()
+def get_courses(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(Course).filter(Course.user_id == user_id)
+    return paginate(query, COURSE_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
 
 def create_course(db: Session, course: CourseCreate, user_id: int):
     db_course = Course(**course.dict(), user_id=user_id)
@@ -19,49 +27,80 @@ def get_course(db: Session, course_id: int, user_id: int):
     return db.query(Course).filter(Course.id == course_id, Course.user_id == user_id).first()
 
 # Assignment CRUD
-def get_assignments(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Assignment).filter(Assignment.user_id == user_id).offset(skip).limit(limit).all()
+def get_assignments(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(Assignment).filter(Assignment.user_id == user_id)
+    return paginate(query, ASSIGNMENT_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
 
 def create_assignment(db: Session, assignment: AssignmentCreate, user_id: int):
     db_assignment = Assignment(**assignment.dict(), user_id=user_id)
     db.add(db_assignment)
     db.commit()
     db.refresh(db_assignment)
+    bump_version("assignments", user_id)
     return db_assignment
 
 def get_assignment(db: Session, assignment_id: int, user_id: int):
     return db.query(Assignment).filter(Assignment.id == assignment_id, Assignment.user_id == user_id).first()
 
+async def get_assignment_async(db: AsyncSession, assignment_id: int, user_id: int):
+    result = await db.execute(
+        select(Assignment).filter(Assignment.id == assignment_id, Assignment.user_id == user_id)
+    )
+    return result.scalars().first()
+
 def update_assignment(db: Session, db_obj: Assignment, obj_in: AssignmentUpdate):
     for field, value in obj_in.dict(exclude_unset=True).items():
         setattr(db_obj, field, value)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    bump_version("assignments", db_obj.user_id)
     return db_obj
 
 def delete_assignment(db: Session, db_obj: Assignment):
+    user_id = db_obj.user_id
     db.delete(db_obj)
     db.commit()
+    bump_version("assignments", user_id)
     return db_obj
 
-# Subtask CRUD
-def create_subtask(db: Session, subtask: SubtaskCreate, assignment_id: int):
-    db_subtask = Subtask(**subtask.dict(), assignment_id=assignment_id)
-    db.add(db_subtask)
-    db.commit()
-    db.refresh(db_subtask)
-    return db_subtask
+# Subtask CRUD (subtasks are embedded in the assignment list, so writes bump its version).
+# All creates go through one INSERT ... RETURNING, however many subtasks there are.
+def _subtask_rows(assignment: Assignment, objs_in: List[SubtaskCreate]) -> List[dict]:
+    return [{**obj_in.dict(), "assignment_id": assignment.id} for obj_in in objs_in]
+
+def create_subtasks(db: Session, assignment: Assignment, objs_in: List[SubtaskCreate]) -> List[Subtask]:
+    created = subtask.create_many(db, objs_in=_subtask_rows(assignment, objs_in))
+    bump_version("assignments", assignment.user_id)
+    return created
+
+async def create_subtasks_async(db: AsyncSession, assignment: Assignment, objs_in: List[SubtaskCreate]) -> List[Subtask]:
+    created = await subtask.create_many_async(db, objs_in=_subtask_rows(assignment, objs_in))
+    bump_version("assignments", assignment.user_id)
+    return created
+
 # CRUDAssignment class to match usage in ai.py
 from app.crud.base import CRUDBase
 
 class CRUDAssignment(CRUDBase[Assignment, AssignmentCreate, AssignmentUpdate]):
     def get_multi_by_owner(
-        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100, status: Optional[str] = None
+        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100, status: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[Assignment]:
         query = db.query(self.model).filter(Assignment.user_id == owner_id)
         if status:
             query = query.filter(Assignment.status == status)
-        return query.offset(skip).limit(limit).all()
+        return paginate(query, ASSIGNMENT_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
+
+    async def get_multi_by_owner_async(
+        self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100, status: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Assignment]:
+        query = select(self.model).filter(Assignment.user_id == owner_id)
+        if status:
+            query = query.filter(Assignment.status == status)
+        result = await db.execute(paginate(query, ASSIGNMENT_KEYSET, cursor=cursor, skip=skip, limit=limit))
+        return list(result.scalars().all())
 
 assignment = CRUDAssignment(Assignment)
+subtask = CRUDBase[Subtask, SubtaskCreate, SubtaskUpdate](Subtask)
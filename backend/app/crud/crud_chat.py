@@ -1,12 +1,22 @@
 
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.cache import bump_version
 from app.crud.base import CRUDBase
+from app.crud.pagination import paginate
 from app.models.chat import ChatSession, ChatMessage
 from app.schemas.chat import ChatSessionCreate, ChatSessionUpdate
 
+CHAT_SESSION_KEYSET = (ChatSession.started_at, ChatSession.id)
+CHAT_MESSAGE_KEYSET = (ChatMessage.created_at, ChatMessage.id)
+
 class CRUDChatSession(CRUDBase[ChatSession, ChatSessionCreate, ChatSessionUpdate]):
+    version_resource = "chat_sessions"
+
     def create_with_user(
         self, db: Session, *, obj_in: ChatSessionCreate, user_id: int
     ) -> ChatSession:
@@ -15,18 +25,57 @@ class CRUDChatSession(CRUDBase[ChatSession, ChatSessionCreate, ChatSessionUpdate
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        bump_version(self.version_resource, user_id)
+        return db_obj
+
+    async def create_with_user_async(
+        self, db: AsyncSession, *, obj_in: ChatSessionCreate, user_id: int
+    ) -> ChatSession:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = ChatSession(**obj_in_data, user_id=user_id)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        bump_version(self.version_resource, user_id)
         return db_obj
 
+    async def get_active_async(self, db: AsyncSession, *, user_id: int) -> Optional[ChatSession]:
+        result = await db.execute(
+            select(ChatSession)
+            .filter(ChatSession.user_id == user_id)
+            .filter(ChatSession.ended_at.is_(None))
+        )
+        return result.scalars().first()
+
     def get_multi_by_user(
-        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[ChatSession]:
-        return (
-            db.query(self.model)
-            .filter(ChatSession.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = db.query(self.model).filter(ChatSession.user_id == user_id)
+        return paginate(query, CHAT_SESSION_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
+
+    async def set_summary_async(
+        self,
+        db: AsyncSession,
+        *,
+        session_id: int,
+        summary: str,
+        boundary: Tuple[datetime, int],
+        expected_message_id: Optional[int],
+    ) -> bool:
+        """
+        Store a new summary and its (created_at, id) boundary, unless the boundary is no
+        longer at `expected_message_id` (another summary landed first). True when stored.
+        """
+        query = update(ChatSession).where(ChatSession.id == session_id)
+        if expected_message_id is None:
+            query = query.where(ChatSession.summary_message_id.is_(None))
+        else:
+            query = query.where(ChatSession.summary_message_id == expected_message_id)
+        result = await db.execute(
+            query.values(summary=summary, summary_message_at=boundary[0], summary_message_id=boundary[1])
         )
+        await db.commit()
+        return result.rowcount == 1
 
 chat_session = CRUDChatSession(ChatSession)
 
@@ -50,6 +99,21 @@ class CRUDChatMessage:
         db.refresh(db_obj)
         return db_obj
 
+    async def create_for_session_async(
+        self,
+        db: AsyncSession,
+        *,
+        session_id: int,
+        user_id: int,
+        role: str,
+        content: str,
+    ) -> ChatMessage:
+        db_obj = ChatMessage(session_id=session_id, user_id=user_id, role=role, content=content)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
     def get_messages_by_session(
         self,
         db: Session,
@@ -57,14 +121,36 @@ class CRUDChatMessage:
         session_id: int,
         skip: int = 0,
         limit: int = 500,
+        cursor: Optional[str] = None,
     ) -> List[ChatMessage]:
-        return (
-            db.query(ChatMessage)
-            .filter(ChatMessage.session_id == session_id)
-            .order_by(ChatMessage.created_at.asc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        """Oldest first; pass the previous page's cursor to continue forward."""
+        query = db.query(ChatMessage).filter(ChatMessage.session_id == session_id)
+        return paginate(query, CHAT_MESSAGE_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
+
+    def _after(self, query, after: Optional[Tuple[datetime, int]]):
+        # Same (created_at, id) order the messages are listed in; ids alone are not in
+        # created_at order once write-behind buffers in several workers insert them
+        if after is None:
+            return query
+        return query.filter(tuple_(*CHAT_MESSAGE_KEYSET) > tuple_(*after))
+
+    async def get_after_async(
+        self, db: AsyncSession, *, session_id: int, after: Optional[Tuple[datetime, int]], limit: Optional[int] = None
+    ) -> List[ChatMessage]:
+        """
+        Messages after the (created_at, id) key `after` (all when None), oldest first;
+        with `limit`, only the newest `limit` of them.
+        """
+        query = self._after(select(ChatMessage).filter(ChatMessage.session_id == session_id), after)
+        if limit is None:
+            result = await db.execute(query.order_by(*CHAT_MESSAGE_KEYSET))
+            return list(result.scalars().all())
+        result = await db.execute(query.order_by(*(c.desc() for c in CHAT_MESSAGE_KEYSET)).limit(limit))
+        return list(reversed(result.scalars().all()))
+
+    async def count_after_async(self, db: AsyncSession, *, session_id: int, after: Optional[Tuple[datetime, int]]) -> int:
+        query = select(func.count()).select_from(ChatMessage).filter(ChatMessage.session_id == session_id)
+        query = self._after(query, after)
+        return (await db.execute(query)).scalar_one()
 
 chat_message = CRUDChatMessage()
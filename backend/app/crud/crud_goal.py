@@ -1,32 +1,47 @@
-from typing import List
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.goal import Goal, GoalSession
 from app.schemas.goal import GoalCreate, GoalUpdate, GoalSessionCreate
+from app.core.cache import bump_version
+from app.crud.pagination import paginate
 
-def get_goals(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Goal).filter(Goal.user_id == user_id).offset(skip).limit(limit).all()
+GOAL_KEYSET = (Goal.created_at, Goal.id)
+
+def get_goals(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(Goal).filter(Goal.user_id == user_id)
+    return paginate(query, GOAL_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
 
 def create_goal(db: Session, goal: GoalCreate, user_id: int):
     db_goal = Goal(**goal.dict(), user_id=user_id)
     db.add(db_goal)
     db.commit()
     db.refresh(db_goal)
+    bump_version("goals", user_id)
     return db_goal
 
 def get_goal(db: Session, goal_id: int, user_id: int):
     return db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == user_id).first()
 
+async def get_goal_async(db: AsyncSession, goal_id: int, user_id: int):
+    result = await db.execute(select(Goal).filter(Goal.id == goal_id, Goal.user_id == user_id))
+    return result.scalars().first()
+
 def update_goal(db: Session, db_obj: Goal, obj_in: GoalUpdate):
     for field, value in obj_in.dict(exclude_unset=True).items():
         setattr(db_obj, field, value)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    bump_version("goals", db_obj.user_id)
     return db_obj
 
 def delete_goal(db: Session, db_obj: Goal):
+    user_id = db_obj.user_id
     db.delete(db_obj)
     db.commit()
+    bump_version("goals", user_id)
     return db_obj
 
 # GoalSession CRUD
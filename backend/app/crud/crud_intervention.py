@@ -1,13 +1,17 @@
 
-from typing import List
+from typing import List, Optional
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
+from app.crud.pagination import paginate
 from app.models.intervention import Intervention, InterventionSession
 from app.schemas.intervention import InterventionCreate, InterventionUpdate, InterventionSessionCreate, InterventionSessionUpdate
 
+INTERVENTION_SESSION_KEYSET = (InterventionSession.started_at, InterventionSession.id)
+
 class CRUDIntervention(CRUDBase[Intervention, InterventionCreate, InterventionUpdate]):
-    pass
+    version_resource = "interventions"
+    version_per_user = False
 
 class CRUDInterventionSession(CRUDBase[InterventionSession, InterventionSessionCreate, InterventionSessionUpdate]):
     def create_with_user(
@@ -21,15 +25,10 @@ class CRUDInterventionSession(CRUDBase[InterventionSession, InterventionSessionC
         return db_obj
 
     def get_multi_by_user(
-        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[InterventionSession]:
-        return (
-            db.query(self.model)
-            .filter(InterventionSession.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = db.query(self.model).filter(InterventionSession.user_id == user_id)
+        return paginate(query, INTERVENTION_SESSION_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
 
 intervention = CRUDIntervention(Intervention)
 intervention_session = CRUDInterventionSession(InterventionSession)
@@ -1,14 +1,22 @@
 
-from typing import List
+from typing import List, Optional
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import bump_version
 from app.crud.base import CRUDBase
+from app.crud.pagination import paginate
 from app.models.mood import MoodCheckin
 from app.schemas.mood import MoodCheckinCreate, MoodCheckinUpdate
 
+MOOD_KEYSET = (MoodCheckin.created_at, MoodCheckin.id)
+
 class CRUDMoodCheckin(CRUDBase[MoodCheckin, MoodCheckinCreate, MoodCheckinUpdate]):
+    version_resource = "mood"
+
     def create_with_owner(
         self, db: Session, *, obj_in: MoodCheckinCreate, owner_id: int
     ) -> MoodCheckin:
@@ -17,17 +25,32 @@ class CRUDMoodCheckin(CRUDBase[MoodCheckin, MoodCheckinCreate, MoodCheckinUpdate
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        bump_version(self.version_resource, owner_id)
+        return db_obj
+
+    async def create_with_owner_async(
+        self, db: AsyncSession, *, obj_in: MoodCheckinCreate, owner_id: int
+    ) -> MoodCheckin:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = MoodCheckin(**obj_in_data, user_id=owner_id)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        bump_version(self.version_resource, owner_id)
         return db_obj
 
     def get_multi_by_owner(
-        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[MoodCheckin]:
+        """Most recent check-ins first."""
+        query = db.query(self.model).filter(MoodCheckin.user_id == owner_id)
+        return paginate(query, MOOD_KEYSET, cursor=cursor, skip=skip, limit=limit, descending=True).all()
+
+    async def get_multi_by_owner_async(
+        self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[MoodCheckin]:
-        return (
-            db.query(self.model)
-            .filter(MoodCheckin.user_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = select(self.model).filter(MoodCheckin.user_id == owner_id)
+        result = await db.execute(paginate(query, MOOD_KEYSET, cursor=cursor, skip=skip, limit=limit, descending=True))
+        return list(result.scalars().all())
 
 mood_checkin = CRUDMoodCheckin(MoodCheckin)
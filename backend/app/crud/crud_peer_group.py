@@ -6,12 +6,16 @@ from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.peer_group import PeerGroup, GroupMember, GroupMessage
 from app.schemas.peer_group import PeerGroupCreate, PeerGroupUpdate
+from app.crud.pagination import paginate
+
+MEMBER_KEYSET = (GroupMember.joined_at, GroupMember.id)
+GROUP_MESSAGE_KEYSET = (GroupMessage.created_at, GroupMessage.id)
 
 class CRUDPeerGroup(CRUDBase[PeerGroup, PeerGroupCreate, PeerGroupUpdate]):
     def get_multi_with_members(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[PeerGroup]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return paginate(db.query(self.model), (PeerGroup.id,), cursor=cursor, skip=skip, limit=limit).all()
 
     def join_group(self, db: Session, *, group_id: int, user_id: int) -> GroupMember:
         db_obj = GroupMember(group_id=group_id, user_id=user_id)
@@ -31,8 +35,9 @@ class CRUDPeerGroup(CRUDBase[PeerGroup, PeerGroupCreate, PeerGroupUpdate]):
         db.commit()
         return obj
 
-    def get_members(self, db: Session, *, group_id: int, skip: int = 0, limit: int = 100) -> List[GroupMember]:
-        return db.query(GroupMember).filter(GroupMember.group_id == group_id).offset(skip).limit(limit).all()
+    def get_members(self, db: Session, *, group_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[GroupMember]:
+        query = db.query(GroupMember).filter(GroupMember.group_id == group_id)
+        return paginate(query, MEMBER_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
 
     def create_message(self, db: Session, *, group_id: int, user_id: int, content: str) -> GroupMessage:
         db_obj = GroupMessage(group_id=group_id, user_id=user_id, content=content)
@@ -41,7 +46,9 @@ class CRUDPeerGroup(CRUDBase[PeerGroup, PeerGroupCreate, PeerGroupUpdate]):
         db.refresh(db_obj)
         return db_obj
 
-    def get_messages(self, db: Session, *, group_id: int, skip: int = 0, limit: int = 100) -> List[GroupMessage]:
-        return db.query(GroupMessage).filter(GroupMessage.group_id == group_id).order_by(GroupMessage.created_at.desc()).offset(skip).limit(limit).all()
+    def get_messages(self, db: Session, *, group_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[GroupMessage]:
+        """Newest first; pass the previous page's cursor to page back through history."""
+        query = db.query(GroupMessage).filter(GroupMessage.group_id == group_id)
+        return paginate(query, GROUP_MESSAGE_KEYSET, cursor=cursor, skip=skip, limit=limit, descending=True).all()
 
 peer_group = CRUDPeerGroup(PeerGroup)
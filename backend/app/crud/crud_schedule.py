@@ -1,23 +1,47 @@
 
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.schedule import ScheduleBlock
+from app.models.schedule import BlockStatus, ScheduleBlock
 from app.schemas.schedule import ScheduleBlockCreate, ScheduleBlockUpdate
+from app.core.cache import bump_version
+from app.crud.pagination import paginate
 
-def get_schedule_blocks(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(ScheduleBlock).filter(ScheduleBlock.user_id == user_id).offset(skip).limit(limit).all()
+SCHEDULE_KEYSET = (ScheduleBlock.start_at, ScheduleBlock.id)
+
+def get_schedule_blocks(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(ScheduleBlock).filter(ScheduleBlock.user_id == user_id)
+    return paginate(query, SCHEDULE_KEYSET, cursor=cursor, skip=skip, limit=limit).all()
 
 def create_schedule_block(db: Session, block: ScheduleBlockCreate, user_id: int):
     db_block = ScheduleBlock(**block.dict(), user_id=user_id)
     db.add(db_block)
     db.commit()
     db.refresh(db_block)
+    bump_version("schedule", user_id)
     return db_block
 
+async def get_active_blocks_between_async(db: AsyncSession, user_id: int, start: datetime, end: datetime) -> List[ScheduleBlock]:
+    result = await db.execute(
+        select(ScheduleBlock)
+        .filter(
+            ScheduleBlock.user_id == user_id,
+            ScheduleBlock.start_at >= start,
+            ScheduleBlock.start_at < end,
+            ScheduleBlock.status != BlockStatus.CANCELED,
+        )
+        .order_by(ScheduleBlock.start_at)
+    )
+    return list(result.scalars().all())
+
 def get_schedule_block(db: Session, block_id: int, user_id: int):
     return db.query(ScheduleBlock).filter(ScheduleBlock.id == block_id, ScheduleBlock.user_id == user_id).first()
 
 def delete_schedule_block(db: Session, db_obj: ScheduleBlock):
+    user_id = db_obj.user_id
     db.delete(db_obj)
     db.commit()
+    bump_version("schedule", user_id)
     return db_obj
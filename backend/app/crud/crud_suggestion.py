@@ -1,27 +1,39 @@
 from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
+from app.crud.base import CRUDBase
 from app.models.suggestion import WellbeingSuggestion
 from app.schemas.suggestion import WellbeingSuggestionCreate
 
+wellbeing_suggestion = CRUDBase[WellbeingSuggestion, WellbeingSuggestionCreate, WellbeingSuggestionCreate](WellbeingSuggestion)
+
+def _rows(user_id: int, items: List[WellbeingSuggestionCreate], mood_checkin_id: Optional[int]) -> List[dict]:
+    return [
+        {
+            "user_id": user_id,
+            "mood_checkin_id": mood_checkin_id,
+            "title": item.title,
+            "description": item.description,
+            "category": item.category,
+            "expires_at": item.expires_at,
+        }
+        for item in items
+    ]
+
 def create_many(db: Session, user_id: int, items: List[WellbeingSuggestionCreate], mood_checkin_id: Optional[int] = None) -> List[WellbeingSuggestion]:
-    created: List[WellbeingSuggestion] = []
-    for item in items:
-        obj = WellbeingSuggestion(
-            user_id=user_id,
-            mood_checkin_id=mood_checkin_id,
-            title=item.title,
-            description=item.description,
-            category=item.category,
-            expires_at=item.expires_at,
-        )
-        db.add(obj)
-        created.append(obj)
-    db.commit()
-    for obj in created:
-        db.refresh(obj)
-    return created
+    return wellbeing_suggestion.create_many(db, objs_in=_rows(user_id, items, mood_checkin_id))
+
+async def create_many_async(db: AsyncSession, user_id: int, items: List[WellbeingSuggestionCreate], mood_checkin_id: Optional[int] = None) -> List[WellbeingSuggestion]:
+    return await wellbeing_suggestion.create_many_async(db, objs_in=_rows(user_id, items, mood_checkin_id))
 
 def latest_for_user(db: Session, user_id: int, since_minutes: int = 1440) -> List[WellbeingSuggestion]:
     threshold = datetime.utcnow()
-    return db.query(WellbeingSuggestion).filter(WellbeingSuggestion.user_id == user_id).order_by(WellbeingSuggestion.created_at.desc()).limit(10).all()
\ No newline at end of file
+    return db.query(WellbeingSuggestion).filter(WellbeingSuggestion.user_id == user_id).order_by(WellbeingSuggestion.created_at.desc()).limit(10).all()
+
+async def latest_for_user_async(db: AsyncSession, user_id: int) -> List[WellbeingSuggestion]:
+    result = await db.execute(
+        select(WellbeingSuggestion).filter(WellbeingSuggestion.user_id == user_id).order_by(WellbeingSuggestion.created_at.desc()).limit(10)
+    )
+    return list(result.scalars().all())
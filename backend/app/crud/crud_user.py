@@ -1,6 +1,10 @@
-from typing import Optional
-from sqlalchemy.orm import Session
-from app.core.security import get_password_hash, verify_password
+from typing import Any, Dict, Optional
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password, verify_and_update_password_async
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.crud.base import CRUDBase
@@ -22,11 +26,21 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         return db_obj
     
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
-        user = self.get_by_email(db, email=email)
+        return authenticate(db, email, password)
+
+    async def authenticate_async(self, db: AsyncSession, *, email: str, password: str) -> Optional[User]:
+        """authenticate without blocking the event loop; also re-hashes outdated hashes."""
+        result = await db.execute(select(User).filter(User.email == email))
+        user = result.scalars().first()
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+        if not valid:
             return None
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+            invalidate_cached_user(user.id)
         return user
 
     def update_user(self, db: Session, *, db_obj: User, obj_in: UserUpdate) -> User:
@@ -39,6 +53,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             setattr(db_obj, field, value)
         db.add(db_obj)
         db.commit()
+        invalidate_cached_user(db_obj.id)
         db.refresh(db_obj)
         return db_obj
 
@@ -46,6 +61,42 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
 def get_user(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
 
+# Cached lookup for get_current_user. The snapshot holds plain column values only; the
+# password hash is left out so it never reaches the cache and is loaded on demand.
+_SNAPSHOT_EXCLUDE = {"hashed_password"}
+
+def _user_cache_key(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+def _user_snapshot(db_user: User) -> Dict[str, Any]:
+    return {
+        attr.key: getattr(db_user, attr.key)
+        for attr in inspect(User).column_attrs
+        if attr.key not in _SNAPSHOT_EXCLUDE
+    }
+
+def get_user_cached(db: Session, user_id: int) -> Optional[User]:
+    """
+    get_user backed by the cache for USER_CACHE_TTL seconds. A hit is rebuilt from the
+    snapshot and merged into `db` without a query, so it behaves like a loaded row:
+    relationships and excluded columns load lazily and it can be updated as usual.
+    """
+    if settings.USER_CACHE_TTL <= 0:
+        return get_user(db, user_id=user_id)
+    snapshot = cache.get(_user_cache_key(user_id))
+    if snapshot is None:
+        db_user = get_user(db, user_id=user_id)
+        if db_user is not None:
+            cache.set(_user_cache_key(user_id), _user_snapshot(db_user), ttl=settings.USER_CACHE_TTL)
+        return db_user
+    db_user = User(**snapshot)
+    make_transient_to_detached(db_user)
+    return db.merge(db_user, load=False)
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Call after committing any change to the user row (including deletes)."""
+    cache.delete(_user_cache_key(user_id))
+
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
@@ -61,9 +112,18 @@ def authenticate(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        # Stored with outdated parameters (PASSWORD_HASH_ROUNDS changed): upgrade it now
+        user.hashed_password = new_hash
+        db.commit()
+        invalidate_cached_user(user.id)
     return user
 
 user = CRUDUser(User)
 crud_user = user  # Alias for compatibility
+# Endpoints call these through the module (crud.crud_user.<name>)
+get_by_email = user.get_by_email
+update_user = user.update_user
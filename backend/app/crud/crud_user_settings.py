@@ -1,10 +1,13 @@
 from typing import Optional
 from sqlalchemy.orm import Session
+from app.core.cache import bump_version
 from app.crud.base import CRUDBase
 from app.models.user_settings import UserSettings
 from app.schemas.user_settings import UserSettingsCreate, UserSettingsUpdate
 
 class CRUDUserSettings(CRUDBase[UserSettings, UserSettingsCreate, UserSettingsUpdate]):
+    version_resource = "settings"
+
     def get_by_user_id(self, db: Session, *, user_id: int) -> Optional[UserSettings]:
         return db.query(UserSettings).filter(UserSettings.user_id == user_id).first()
 
@@ -18,6 +21,7 @@ class CRUDUserSettings(CRUDBase[UserSettings, UserSettingsCreate, UserSettingsUp
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        bump_version(self.version_resource, user_id)
         return db_obj
 
     def update_settings(
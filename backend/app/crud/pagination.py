@@ -0,0 +1,65 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque, URL-safe cursor for a row's sort key, e.g. (created_at, id)."""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(v) if v is not None and column.type.python_type is datetime else v
+            for v, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def keyset(query, columns: Sequence[InstrumentedAttribute], cursor: Optional[str] = None, descending: bool = False):
+    """
+    Order a Query/Select by `columns` and, given a cursor, seek past the last row of the
+    previous page with a row-value comparison instead of OFFSET.
+    Columns must form a unique key (end with the primary key) and be non-null; a
+    timestamp must be stored at the precision the cursor carries (see app.db.base.utcnow).
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*values) if descending else key > tuple_(*values))
+    return query.order_by(*[c.desc() if descending else c.asc() for c in columns])
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int, columns: Sequence[InstrumentedAttribute]) -> None:
+    """
+    Advertise the cursor for the page after `items` when the page came back full.
+    Works for both cursor and skip/limit requests, so clients can switch over at any point.
+    """
+    if items and len(items) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(items[-1], c.key) for c in columns])
+
+
+def paginate(query, columns: Sequence[InstrumentedAttribute], *, cursor: Optional[str] = None, skip: int = 0, limit: int = 100, descending: bool = False):
+    """Keyset page when a cursor is given, otherwise skip/limit (OFFSET) as before, in the same stable order."""
+    query = keyset(query, columns, cursor, descending)
+    if skip and not cursor:
+        query = query.offset(skip)
+    return query.limit(limit)
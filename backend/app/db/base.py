@@ -1,5 +1,6 @@
-
+from datetime import datetime, timezone
 from typing import Any
+
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 
 @as_declarative()
@@ -11,3 +12,12 @@ class Base:
     @declared_attr
     def __tablename__(cls) -> str:
         return cls.__name__.lower()
+
+
+def utcnow() -> datetime:
+    """
+    Client-side default for timestamps used as keyset sort keys. Unlike func.now(), which
+    SQLite stores to the second, it keeps microseconds, so a cursor round-trips to the
+    exact stored value on every backend.
+    """
+    return datetime.now(timezone.utc)
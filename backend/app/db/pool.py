@@ -0,0 +1,121 @@
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+
+class _MeteredPoolMixin:
+    """
+    Records how long callers wait for a pooled connection (`_do_get`, i.e. queue wait
+    plus any new connection) and the full checkout latency (`connect`, including pings).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = LatencyStats()
+        self.checkout_stats = LatencyStats()
+        self.pings = 0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_stats.observe(time.perf_counter() - start)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.checkout_stats.observe(time.perf_counter() - start)
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_memory_sqlite(uri: str) -> bool:
+    scheme, _, path = uri.partition("://")
+    return scheme.startswith("sqlite") and (path in ("", "/") or ":memory:" in path or "mode=memory" in path)
+
+
+def engine_options(uri: str, *, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build create_engine()/create_async_engine() keyword arguments from Settings.
+    In-memory SQLite keeps its default single-connection pool.
+    """
+    if _is_memory_sqlite(uri):
+        return {}
+    return {
+        "poolclass": MeteredAsyncAdaptedQueuePool if is_async else MeteredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def install_idle_pre_ping(engine: Engine) -> None:
+    """
+    Ping a connection on checkout only if it sat idle in the pool longer than
+    DB_POOL_PRE_PING_IDLE_SECONDS, instead of paying a round-trip on every checkout.
+    Raising DisconnectionError makes the pool discard the connection and retry.
+    """
+    if settings.DB_POOL_PRE_PING != "idle":
+        return
+    idle_limit = settings.DB_POOL_PRE_PING_IDLE_SECONDS
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_limit:
+            return
+        if isinstance(engine.pool, _MeteredPoolMixin):
+            engine.pool.pings += 1
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as e:
+            raise exc.DisconnectionError() from e
+        finally:
+            cursor.close()
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, _MeteredPoolMixin):
+        status.update(
+            wait=pool.wait_stats.snapshot(),
+            checkout=pool.checkout_stats.snapshot(),
+            pings=pool.pings,
+            timeouts=pool.timeouts,
+        )
+    return status
@@ -1,7 +1,21 @@
-
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import engine_options, install_idle_pre_ping
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **engine_options(settings.SQLALCHEMY_DATABASE_URI))
+install_idle_pre_ping(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine for `async def` endpoints, so DB I/O does not block the event loop.
+# expire_on_commit=False keeps attributes loaded after commit, since lazy
+# refreshes are not possible on an AsyncSession.
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URI,
+    **engine_options(settings.SQLALCHEMY_ASYNC_DATABASE_URI, is_async=True),
+)
+install_idle_pre_ping(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
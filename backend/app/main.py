@@ -1,11 +1,38 @@
 
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 from app.core.config import settings
+from app.crud.pagination import NEXT_CURSOR_HEADER, InvalidCursor
+from app.db.pool import pool_status
+from app.db.session import async_engine, engine
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.sql_metrics import SQLMetricsMiddleware, instrument_engine
+from app.services.ai_service import ai_service
+from app.services.chat_writer import chat_writer
+from app.services.llm_breaker import llm_breakers
+from app.services.llm_cache import llm_cache
+from app.services.llm_metrics import ai_metrics, chat_ttft
+from app.services.llm_scheduler import llm_scheduler
+from app.services.single_flight import llm_flights
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if ai_service.backend is not None:
+        await ai_service.backend.warm_up()
+    yield
+    # Chat messages still held by the write-behind buffer
+    await chat_writer.close()
+    if ai_service.backend is not None:
+        await ai_service.backend.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -26,8 +53,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-DB-Query-Count", NEXT_CURSOR_HEADER, "ETag", "Retry-After", "X-Suggestions-Status"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    app.add_middleware(SQLMetricsMiddleware)
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
 from app.api.api_v1.api import api_router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -38,3 +83,51 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+@app.get("/health/llm")
+def llm_health_check():
+    """
+    LLM usage in this worker: completion cache hits and misses per AIService method,
+    calls saved by joining an identical in-flight request, scheduler concurrency and
+    queue wait per priority class, circuit breaker state with latency percentiles and
+    the current timeout per model and method, HTTP connection reuse, and time to first
+    token of streamed chat replies.
+    """
+    return {
+        "cache": {"backend": settings.LLM_CACHE_BACKEND, "methods": llm_cache.stats()},
+        "coalesced": llm_flights.stats(),
+        "scheduler": llm_scheduler.stats(),
+        "breakers": llm_breakers.stats(),
+        "connections": ai_metrics.connection_stats(),
+        "chat_stream_ttft": chat_ttft.snapshot(),
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """
+    Per-method AI telemetry for this worker in Prometheus text format: latency by outcome,
+    token and estimated cost histograms, calls, fallbacks to mock output and cache hits.
+    """
+    return PlainTextResponse(ai_metrics.render(llm_cache.stats()), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/db")
+def db_health_check(response: Response):
+    """
+    Probe the database and report connection pool usage for this worker, and how many
+    chat messages the write-behind buffer holds that are not yet in the database.
+    """
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception:
+        status = "error"
+        response.status_code = 503
+    return {
+        "status": status,
+        "probe_ms": round((time.perf_counter() - start) * 1000, 3),
+        "pool": pool_status(engine),
+        "async_pool": pool_status(async_engine.sync_engine),
+        "chat_write_behind": chat_writer.stats(),
+    }
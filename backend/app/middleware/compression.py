@@ -0,0 +1,75 @@
+from typing import Dict
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}, dropping codings the client refuses (q=0)."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted[coding] = q
+    return accepted
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = 4):
+        super().__init__(app, minimum_size, exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        data = self._compressor.process(body)
+        # Flush every chunk of a streamed body so the client is never waiting on our buffer
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware:
+    """
+    Compress responses of at least `minimum_size` bytes with brotli (when installed and
+    preferred by the client) or gzip. Streamed bodies are compressed chunk by chunk and
+    flushed, never buffered; event streams, already-encoded bodies and media types that
+    are already compressed pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        responder: ASGIApp
+        if BROTLI_AVAILABLE and "br" in accepted and accepted["br"] >= accepted.get("gzip", 0):
+            responder = BrotliResponder(self.app, self.minimum_size, quality=self.brotli_quality)
+        elif "gzip" in accepted:
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
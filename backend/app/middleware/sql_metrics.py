@@ -0,0 +1,103 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so the same query with different parameters compares equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _NUMBER.sub("?", shape)
+
+
+class QueryStats:
+    """SQL statements executed while handling a single request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+# Mutated (never re-set) by engine events, so sync endpoints running in the
+# threadpool record into the same object the middleware created.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is None or not conn.info.get("query_start"):
+            return
+        stats.record(statement, time.perf_counter() - conn.info["query_start"].pop())
+
+
+class SQLMetricsMiddleware:
+    """
+    Count statements and DB time per request, report them in Server-Timing,
+    and log slow requests and repeated statement shapes (likely N+1 queries).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f'db;dur={stats.total * 1000:.2f};desc="{stats.count} queries"')
+                headers["X-DB-Query-Count"] = str(stats.count)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        if not stats.count:
+            return
+        route = f'{scope.get("method", "")} {scope.get("path", "")}'
+        total_ms = stats.total * 1000
+        if total_ms >= settings.SQL_SLOW_REQUEST_MS:
+            logger.warning("Slow DB work on %s: %d queries, %.1f ms", route, stats.count, total_ms)
+        for shape, n in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            logger.warning("Likely N+1 on %s: statement ran %d times: %s", route, n, shape[:300])
@@ -2,7 +2,7 @@ from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 class AccountabilityPair(Base):
     __tablename__ = "accountability_pairs"
@@ -24,7 +24,7 @@ class PairNudge(Base):
     pair_id = Column(Integer, ForeignKey("accountability_pairs.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
 
     pair = relationship("AccountabilityPair")
     user = relationship("User")
\ No newline at end of file
@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SqEnum, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.db.base import Base
+from app.db.base import Base, utcnow
 import enum
 
 class ActivityType(str, enum.Enum):
@@ -25,7 +25,7 @@ class ActivitySession(Base):
     selected_duration_minutes = Column(Integer, nullable=False)
     actual_runtime_seconds = Column(Integer, default=0)
 
-    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     ended_at = Column(DateTime(timezone=True), nullable=True)
     status = Column(SqEnum(ActivityStatus), default=ActivityStatus.IN_PROGRESS)
 
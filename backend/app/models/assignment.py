@@ -2,7 +2,7 @@
 from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Enum as SqEnum, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.db.base import Base
+from app.db.base import Base, utcnow
 import enum
 
 class DifficultyLevel(int, enum.Enum):
@@ -37,7 +37,7 @@ class Course(Base):
     name = Column(String, index=True, nullable=False)
     code = Column(String, index=True)
     color_hex = Column(String, default="#3B82F6")
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     
     owner = relationship("User", backref="courses")
     assignments = relationship("Assignment", back_populates="course", cascade="all, delete-orphan")
@@ -60,7 +60,7 @@ class Assignment(Base):
     ai_context_summary = Column(Text, nullable=True)
     is_group = Column(Boolean, default=False)
     ai_generated_plan = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     owner = relationship("User", back_populates="assignments")
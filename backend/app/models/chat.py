@@ -1,9 +1,9 @@
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum as SqEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text, Enum as SqEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 class RiskFlag(str, enum.Enum):
     NONE = "none"
@@ -12,13 +12,19 @@ class RiskFlag(str, enum.Enum):
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        Index("ix_chat_sessions_user_id_ended_at", "user_id", "ended_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
-    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     ended_at = Column(DateTime(timezone=True), nullable=True)
     summary = Column(Text, nullable=True)
+    # Last message folded into summary, as its (created_at, id) sort key
+    summary_message_at = Column(DateTime(timezone=True), nullable=True)
+    summary_message_id = Column(Integer, nullable=True)
     risk_flag = Column(SqEnum(RiskFlag), default=RiskFlag.NONE)
 
     user = relationship("User")
@@ -27,13 +33,16 @@ class ChatSession(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_session_id_created_at_id", "session_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("chat_sessions.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     role = Column(String(20), nullable=False)  # 'user' or 'assistant'
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
 
     session = relationship("ChatSession", back_populates="messages")
     user = relationship("User")
@@ -2,7 +2,7 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SqEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.db.base import Base
+from app.db.base import Base, utcnow
 import enum
 
 class GoalSessionStatus(str, enum.Enum):
@@ -21,7 +21,7 @@ class Goal(Base):
     duration_minutes = Column(Integer, nullable=False)
     preferred_time_window = Column(String, nullable=True)
     sessions_per_week = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     owner = relationship("User", backref="goals")
@@ -3,7 +3,7 @@ from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 class InterventionCategory(str, enum.Enum):
     BREATHING = "breathing"
@@ -38,7 +38,7 @@ class InterventionSession(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     intervention_id = Column(Integer, ForeignKey("interventions.id"), nullable=False)
     
-    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     user_feedback = Column(SqEnum(UserFeedback), nullable=True)
     context_snapshot = Column(JSON, nullable=True) # mood, workload at time
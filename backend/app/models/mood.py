@@ -1,9 +1,9 @@
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Enum as SqEnum, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text, Float, Enum as SqEnum, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 class MoodValence(str, enum.Enum):
     VERY_NEGATIVE = "very_negative"
@@ -19,6 +19,9 @@ class RiskAssessment(str, enum.Enum):
 
 class MoodCheckin(Base):
     __tablename__ = "mood_checkins"
+    __table_args__ = (
+        Index("ix_mood_checkins_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -36,6 +39,6 @@ class MoodCheckin(Base):
     ai_risk_assessment = Column(SqEnum(RiskAssessment), default=RiskAssessment.LOW)
     ai_recommended_actions = Column(JSON, default=list)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False, index=True)
 
     user = relationship("User", back_populates="mood_logs")
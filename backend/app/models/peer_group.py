@@ -1,9 +1,9 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, Table, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 class PeerGroup(Base):
     __tablename__ = "peer_groups"
@@ -18,11 +18,14 @@ class PeerGroup(Base):
 
 class GroupMember(Base):
     __tablename__ = "group_members"
+    __table_args__ = (
+        Index("ux_group_members_group_id_user_id", "group_id", "user_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     group_id = Column(Integer, ForeignKey("peer_groups.id"), nullable=False)
-    joined_at = Column(DateTime(timezone=True), server_default=func.now())
+    joined_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     
     # Relationships
     user = relationship("User", back_populates="memberships")
@@ -30,12 +33,15 @@ class GroupMember(Base):
 
 class GroupMessage(Base):
     __tablename__ = "group_messages"
+    __table_args__ = (
+        Index("ix_group_messages_group_id_created_at_id", "group_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     group_id = Column(Integer, ForeignKey("peer_groups.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
     
     # Relationships
     group = relationship("PeerGroup", back_populates="messages")
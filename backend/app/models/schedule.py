@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SqEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Enum as SqEnum
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import enum
@@ -24,6 +24,9 @@ class BlockStatus(str, enum.Enum):
 
 class ScheduleBlock(Base):
     __tablename__ = "schedule_blocks"
+    __table_args__ = (
+        Index("ix_schedule_blocks_user_id_start_at_status", "user_id", "start_at", "status", postgresql_include=["end_at"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,32 +1,140 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
+import asyncio
+import logging
 import random
+import time
 from datetime import datetime, timezone
 from app.core.config import settings
-
-# Try to import OpenAI, but don't fail if it's not installed
-try:
-    from openai import AsyncOpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from app.services.llm_backends import FakeBackend, build_backend
+from app.services.llm_breaker import llm_breakers
+from app.services.llm_cache import llm_cache
+from app.services.llm_metrics import ai_metrics
+from app.services.llm_scheduler import Priority, llm_scheduler
+from app.services.single_flight import llm_flights
+
+logger = logging.getLogger(__name__)
+
+# Scheduling class per method; anything not listed is Priority.INTERACTIVE
+METHOD_PRIORITY = {
+    "chat_response": Priority.CHAT,
+    "wellbeing_suggestions": Priority.SUGGESTIONS,
+    "infer_mood_metrics": Priority.SUGGESTIONS,
+    "summarize_conversation": Priority.SUMMARIES,
+}
 
 class AIService:
     """
     Service for handling AI/LLM interactions.
     Automatically uses OpenAI if API key is configured, otherwise falls back to mock responses.
+    LLM_BACKEND=fake swaps in the local FakeLLM backend (see app/services/llm_backends.py).
     """
 
     def __init__(self):
-        self.use_real_ai = OPENAI_AVAILABLE and settings.OPENAI_API_KEY is not None
+        self.backend = build_backend()
+        self.use_real_ai = self.backend is not None
         if self.use_real_ai:
-            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
             self.model = settings.OPENAI_MODEL
             self.model_fast = getattr(settings, "OPENAI_FAST_MODEL", self.model)
-            print(f"✓ AIService initialized with OpenAI ({self.model})")
+            if isinstance(self.backend, FakeBackend):
+                print(f"✓ AIService initialized with the fake LLM backend ({settings.FAKE_LLM_LATENCY})")
+            else:
+                print(f"✓ AIService initialized with OpenAI ({self.model})")
         else:
-            self.client = None
             print("⚠ AIService running in MOCK mode (no OpenAI API key configured)")
 
+    async def _complete(self, method: str, *, model: str, messages: List[Dict[str, str]], **params: Any) -> str:
+        """
+        Every chat completion goes through here; returns the reply text. Methods listed in
+        settings.LLM_CACHE_TTLS are answered from llm_cache when the same (model, messages,
+        params) was seen before, and concurrent identical calls are coalesced into one.
+        The request itself waits for a slot from llm_scheduler by the method's priority,
+        unless the (model, method) circuit breaker is open, and is bounded by the
+        breaker's adaptive timeout. Errors (a full queue, an open circuit, a timeout)
+        propagate to the caller's fallback and are not cached.
+        """
+        ai_metrics.record_call(method)
+        ttl = settings.LLM_CACHE_TTLS.get(method)
+        key = llm_cache.make_key(method, model, messages, params)
+        if ttl:
+            cached = llm_cache.get(method, key)
+            if cached is not None:
+                return cached
+
+        async def call() -> str:
+            breaker = llm_breakers.get(model, method)
+            breaker.before_call()
+            try:
+                async with llm_scheduler.slot(model, METHOD_PRIORITY.get(method, Priority.INTERACTIVE)):
+                    start = time.perf_counter()
+                    try:
+                        response = await asyncio.wait_for(
+                            self.backend.create(model=model, messages=messages, **params),
+                            timeout=breaker.timeout(),
+                        )
+                    except Exception as e:
+                        breaker.record_failure()
+                        ai_metrics.observe_failure(method, time.perf_counter() - start, e)
+                        raise
+                    elapsed = time.perf_counter() - start
+                    breaker.record_success(elapsed)
+                    ai_metrics.observe_response(method, model, elapsed, getattr(response, "usage", None))
+            finally:
+                breaker.abandon()  # a probe that never reached the upstream does not count
+            reply = response.choices[0].message.content or ""
+            if ttl and reply:
+                llm_cache.set(key, reply, ttl)
+            return reply
+
+        # Identical requests already in flight (a class pasting the same brief) share one call
+        return await llm_flights.do(method, key, call)
+
+    async def _stream(self, method: str, *, model: str, messages: List[Dict[str, str]], **params: Any) -> AsyncIterator[str]:
+        """
+        Streamed counterpart of _complete, yielding text deltas. Streams are neither cached
+        nor coalesced; the scheduler slot is held until the stream ends. The breaker is
+        kept apart from the non-streamed method's and its latency is time to first chunk;
+        the adaptive timeout bounds the wait for each chunk. A stream counts once for the
+        breaker: a success when it ends cleanly, a failure if it breaks at any point.
+        """
+        label = f"{method}:stream"
+        ai_metrics.record_call(label)
+        breaker = llm_breakers.get(model, label)
+        breaker.before_call()
+        try:
+            async with llm_scheduler.slot(model, METHOD_PRIORITY.get(method, Priority.INTERACTIVE)):
+                start = time.perf_counter()
+                timeout = breaker.timeout()
+                first_chunk = None  # seconds to the first chunk, the latency the breaker tracks
+                usage = None
+                try:
+                    stream = await asyncio.wait_for(
+                        self.backend.create(
+                            model=model, messages=messages, stream=True,
+                            stream_options={"include_usage": True}, **params,
+                        ),
+                        timeout=timeout,
+                    )
+                    chunks = stream.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                        except StopAsyncIteration:
+                            break
+                        if first_chunk is None:
+                            first_chunk = time.perf_counter() - start
+                        usage = getattr(chunk, "usage", None) or usage  # only on the final chunk
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                except Exception as e:
+                    breaker.record_failure()
+                    ai_metrics.observe_failure(label, time.perf_counter() - start, e)
+                    raise
+                # One outcome per call, once the stream has ended
+                breaker.record_success(time.perf_counter() - start if first_chunk is None else first_chunk)
+                ai_metrics.observe_response(label, model, time.perf_counter() - start, usage)
+        finally:
+            breaker.abandon()
+
     async def generate_assignment_plan(self, assignment_title: str, assignment_description: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Breaks down an assignment into smaller, manageable subtasks.
@@ -52,7 +160,8 @@ Example format:
 
 Only return the JSON array, no other text."""
 
-                response = await self.client.chat.completions.create(
+                reply = await self._complete(
+                    "generate_assignment_plan",
                     model=self.model,
                     messages=[
                         {"role": "system", "content": "You are a helpful academic planning assistant. Always respond with valid JSON."},
@@ -63,7 +172,7 @@ Only return the JSON array, no other text."""
                 )
                 
                 import json
-                content = response.choices[0].message.content.strip()
+                content = reply.strip()
                 # Remove markdown code blocks if present
                 if content.startswith("```"):
                     content = content.split("```")[1]
@@ -76,6 +185,7 @@ Only return the JSON array, no other text."""
             except Exception as e:
                 print(f"Error calling OpenAI for assignment plan: {e}")
                 # Fall back to mock on error
+            ai_metrics.record_fallback("generate_assignment_plan")
         
         # Mock logic (fallback)
         steps = [
@@ -114,7 +224,8 @@ Only return the JSON array, no other text."""
                     "return JSON with keys: clean_text (de-noised, concise but complete assignment instructions), "
                     "suggested_title (short title). Do not include markdown code fences."
                 )
-                response = await self.client.chat.completions.create(
+                reply = await self._complete(
+                    "extract_assignment_text",
                     model=self.model_fast,
                     messages=[
                         {"role": "system", "content": "Always return valid JSON with keys clean_text and suggested_title."},
@@ -124,7 +235,7 @@ Only return the JSON array, no other text."""
                     max_tokens=400
                 )
                 import json
-                content = response.choices[0].message.content.strip()
+                content = reply.strip()
                 if content.startswith("```"):
                     content = content.split("```")[1]
                     if content.startswith("json"):
@@ -136,6 +247,7 @@ Only return the JSON array, no other text."""
                 return {"clean_text": ct, "suggested_title": st}
             except Exception:
                 pass
+            ai_metrics.record_fallback("extract_assignment_text")
 
         return {"clean_text": cleaned, "suggested_title": suggested_title}
 
@@ -172,7 +284,8 @@ Example:
 
 Only return the JSON object, no other text."""
 
-                response = await self.client.chat.completions.create(
+                reply = await self._complete(
+                    "analyze_mood",
                     model=self.model,
                     messages=[
                         {"role": "system", "content": "You are a supportive wellbeing coach. Always respond with valid JSON."},
@@ -183,7 +296,7 @@ Only return the JSON object, no other text."""
                 )
                 
                 import json
-                content = response.choices[0].message.content.strip()
+                content = reply.strip()
                 if content.startswith("```"):
                     content = content.split("```")[1]
                     if content.startswith("json"):
@@ -195,6 +308,7 @@ Only return the JSON object, no other text."""
             except Exception as e:
                 print(f"Error calling OpenAI for mood analysis: {e}")
                 # Fall back to mock on error
+            ai_metrics.record_fallback("analyze_mood")
         
         # Mock logic (fallback)
         last_log = mood_history[0]
@@ -216,32 +330,26 @@ Only return the JSON object, no other text."""
                 "recommendation": "Maintain a balanced routine."
             }
 
-    async def chat_response(self, message: str, context: Dict[str, Any]) -> str:
-        """
-        Generates a therapist-style response to a user message.
-        Uses OpenAI if available, otherwise returns mock data.
-        """
-        if self.use_real_ai:
+    def _chat_messages(self, message: str, context: Dict[str, Any]) -> List[Dict[str, str]]:
+        user_name = context.get("user_name", "friend")
+        # Build concise context summary
+        upcoming = context.get("upcoming_assignments") or []
+        overdue_count = context.get("overdue_count") or 0
+        next_assignment = context.get("next_assignment") or {}
+        mood_history = context.get("mood_history") or []
+
+        def fmt_due(iso: str) -> str:
             try:
-                user_name = context.get("user_name", "friend")
-                # Build concise context summary
-                upcoming = context.get("upcoming_assignments") or []
-                overdue_count = context.get("overdue_count") or 0
-                next_assignment = context.get("next_assignment") or {}
-                mood_history = context.get("mood_history") or []
-
-                def fmt_due(iso: str) -> str:
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
-                        return dt.strftime("%b %d, %H:%M")
-                    except Exception:
-                        return iso
+                from datetime import datetime
+                dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+                return dt.strftime("%b %d, %H:%M")
+            except Exception:
+                return iso
 
-                upcoming_str = ", ".join([f"{x.get('title')} ({fmt_due(str(x.get('due_at') or ''))})" for x in upcoming[:5]]) or "none"
-                mood_str = "; ".join([f"valence={str(m.get('mood_valence'))}, energy={m.get('energy_level')}, stress={m.get('stress_level')}" for m in mood_history[:5]]) or "no recent check-ins"
+        upcoming_str = ", ".join([f"{x.get('title')} ({fmt_due(str(x.get('due_at') or ''))})" for x in upcoming[:5]]) or "none"
+        mood_str = "; ".join([f"valence={str(m.get('mood_valence'))}, energy={m.get('energy_level')}, stress={m.get('stress_level')}" for m in mood_history[:5]]) or "no recent check-ins"
 
-                system_prompt = """**Role:**
+        system_prompt = """**Role:**
 You are a warm, compassionate, non-judgmental therapeutic companion. You are not a licensed therapist, but you follow evidence-based supportive communication skills (CBT-inspired reflection, grounding, active listening, gentle questioning).
 Your job is to create a safe space for the user to talk, vent, reflect, and process whatever they’re going through.
 
@@ -271,23 +379,68 @@ Create a compassionate conversational space where the user feels safe to speak,
 
 Keep responses concise (2–3 sentences). Be warm, supportive, and invitational."""
 
-                response = await self.client.chat.completions.create(
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": f"Context for {user_name}: mood={mood_str}"},
+        ]
+        # Conversation so far: the rolling summary of older turns plus the recent messages
+        if context.get("conversation_summary"):
+            messages.append({"role": "system", "content": f"Summary of the conversation so far: {context['conversation_summary']}"})
+        messages.extend({"role": m["role"], "content": m["content"]} for m in context.get("recent_messages") or [])
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    async def chat_response(self, message: str, context: Dict[str, Any]) -> str:
+        """
+        Generates a therapist-style response to a user message.
+        Uses OpenAI if available, otherwise returns mock data.
+        """
+        if self.use_real_ai:
+            try:
+                reply = await self._complete(
+                    "chat_response",
                     model=self.model_fast,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "system", "content": f"Context for {user_name}: mood={mood_str}"},
-                        {"role": "user", "content": message}
-                    ],
+                    messages=self._chat_messages(message, context),
                     temperature=0.6,
                     max_tokens=60
                 )
                 
-                return response.choices[0].message.content.strip()
+                return reply.strip()
             except Exception as e:
                 print(f"Error calling OpenAI for chat: {e}")
                 # Fall back to mock on error
+            ai_metrics.record_fallback("chat_response")
         
-        # Mock logic (fallback)
+        return self._mock_chat_reply()
+
+    async def chat_response_stream(self, message: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Streaming variant of chat_response: yields the reply as text deltas, without the
+        60-token cap. If the call fails before the first token the mock reply is yielded
+        instead; a failure mid-stream is raised, since the caller has part of a reply.
+        """
+        if self.use_real_ai:
+            started = False
+            try:
+                async for delta in self._stream(
+                    "chat_response",
+                    model=self.model_fast,
+                    messages=self._chat_messages(message, context),
+                    temperature=0.6,
+                    max_tokens=settings.CHAT_STREAM_MAX_TOKENS,
+                ):
+                    started = True
+                    yield delta
+                return
+            except Exception as e:
+                if started:
+                    raise
+                logger.warning("Error streaming OpenAI chat: %s", e)
+            ai_metrics.record_fallback("chat_response:stream")
+
+        yield self._mock_chat_reply()
+
+    def _mock_chat_reply(self) -> str:
         responses = [
             "I understand. How does that make you feel?",
             "That sounds challenging. What do you think is the best way to handle it?",
@@ -425,7 +578,8 @@ Keep responses concise (2–3 sentences). Be warm, supportive, and invitational.
                     f"energy_level={energy}, stress_level={stress}, anxiety_level={anxiety}, sleep_hours_last_night={sleep}, note=\"{note}\". "
                     "Do not include personal details."
                 )
-                response = await self.client.chat.completions.create(
+                reply = await self._complete(
+                    "infer_mood_metrics",
                     model=self.model,
                     messages=[
                         {"role": "system", "content": "You are a wellbeing metrics generator. Always respond with valid JSON only."},
@@ -435,7 +589,7 @@ Keep responses concise (2–3 sentences). Be warm, supportive, and invitational.
                     max_tokens=400,
                 )
                 import json
-                content = response.choices[0].message.content.strip()
+                content = reply.strip()
                 if content.startswith("```"):
                     content = content.split("```")[1]
                     if content.startswith("json"):
@@ -445,6 +599,7 @@ Keep responses concise (2–3 sentences). Be warm, supportive, and invitational.
                 return result
             except Exception:
                 pass
+            ai_metrics.record_fallback("infer_mood_metrics")
 
         burnout = "not_at_all"
         if stress >= 7 or anxiety >= 7:
@@ -519,7 +674,8 @@ Keep responses concise (2–3 sentences). Be warm, supportive, and invitational.
                     f"Activity: sleep_hours_last_7={activity.get('sleep_hrs_7', 0)}, checkins_7={activity.get('checkins_7', 0)}. "
                     "Categories might include: focus, rest, planning, movement, social. Only return JSON."
                 )
-                response = await self.client.chat.completions.create(
+                reply = await self._complete(
+                    "wellbeing_suggestions",
                     model=self.model,
                     messages=[
                         {"role": "system", "content": "You are a wellbeing coach. Only return valid JSON arrays."},
@@ -529,7 +685,7 @@ Keep responses concise (2–3 sentences). Be warm, supportive, and invitational.
                     max_tokens=300,
                 )
                 import json
-                content = response.choices[0].message.content.strip()
+                content = reply.strip()
                 if content.startswith("```"):
                     content = content.split("```")[1]
                     if content.startswith("json"):
@@ -540,6 +696,7 @@ Keep responses concise (2–3 sentences). Be warm, supportive, and invitational.
             except Exception:
                 # Fall through to mock
                 pass
+            ai_metrics.record_fallback("wellbeing_suggestions")
 
         # Mock suggestions based on simple heuristics
         suggestions: List[Dict[str, Any]] = []
@@ -643,7 +800,8 @@ Select the best 2-3 slots from the candidate list. Only include slots that are i
 
                 # Try to use JSON mode if available (OpenAI API >= 2024-07-01)
                 try:
-                    response = await self.client.chat.completions.create(
+                    reply = await self._complete(
+                        "rank_time_slots",
                         model=self.model_fast,
                         messages=[
                             {"role": "system", "content": system_prompt},
@@ -655,7 +813,8 @@ Select the best 2-3 slots from the candidate list. Only include slots that are i
                     )
                 except TypeError:
                     # Fallback if response_format not supported
-                    response = await self.client.chat.completions.create(
+                    reply = await self._complete(
+                        "rank_time_slots",
                         model=self.model_fast,
                         messages=[
                             {"role": "system", "content": system_prompt},
@@ -665,7 +824,7 @@ Select the best 2-3 slots from the candidate list. Only include slots that are i
                         max_tokens=600
                     )
                 
-                content = response.choices[0].message.content.strip()
+                content = reply.strip()
                 
                 # Remove markdown code blocks if present
                 if content.startswith("```"):
@@ -694,6 +853,7 @@ Select the best 2-3 slots from the candidate list. Only include slots that are i
             except Exception as e:
                 print(f"Error calling OpenAI for time slot ranking: {e}")
                 # Fall through to mock/fallback logic
+            ai_metrics.record_fallback("rank_time_slots")
         
         # Fallback: Return first 2-3 candidate slots with rule-based reasons
         ranked_slots = []
@@ -741,7 +901,8 @@ Select the best 2-3 slots from the candidate list. Only include slots that are i
 Generate a brief, empathetic message (2-3 sentences) acknowledging this and suggesting they consider alternatives like shorter duration or another day.
 Be supportive and encouraging, not discouraging."""
 
-                response = await self.client.chat.completions.create(
+                reply = await self._complete(
+                    "generate_busy_day_message",
                     model=self.model_fast,
                     messages=[
                         {"role": "system", "content": "You are a supportive scheduling assistant. Be brief and encouraging."},
@@ -751,13 +912,48 @@ Be supportive and encouraging, not discouraging."""
                     max_tokens=150
                 )
                 
-                message = response.choices[0].message.content.strip()
+                message = reply.strip()
                 return message
             except Exception as e:
                 print(f"Error calling OpenAI for busy day message: {e}")
                 # Fall through to default
+            ai_metrics.record_fallback("generate_busy_day_message")
         
         # Default fallback message
         return f"Your calendar is quite full on {target_date}. Consider these alternatives:"
 
+    async def summarize_conversation(self, previous_summary: Optional[str], messages: List[Dict[str, str]]) -> str:
+        """
+        Fold `messages` (oldest first) into the running summary of a chat session.
+        Falls back to appending the user's messages, trimmed, if the LLM is unavailable.
+        """
+        if self.use_real_ai:
+            try:
+                transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+                reply = await self._complete(
+                    "summarize_conversation",
+                    model=self.model_fast,
+                    messages=[
+                        {"role": "system", "content": (
+                            "You maintain a running summary of a supportive conversation with a student. "
+                            "Update the summary with the new messages. Keep what matters for continuing the "
+                            "conversation: feelings shared, situations and stressors mentioned, anything the "
+                            "student asked to remember. At most 120 words, third person, no advice."
+                        )},
+                        {"role": "user", "content": f"Current summary: {previous_summary or 'none'}\n\nNew messages:\n{transcript}"},
+                    ],
+                    temperature=0.3,
+                    max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+                )
+                summary = reply.strip()
+                if summary:
+                    return summary
+            except Exception as e:
+                logger.warning("Error calling OpenAI for conversation summary: %s", e)
+            ai_metrics.record_fallback("summarize_conversation")
+
+        said = "; ".join(m["content"][:80] for m in messages if m["role"] == "user")
+        summary = f"{previous_summary} The student also said: {said}" if previous_summary else f"The student said: {said}"
+        return summary[-1200:]
+
 ai_service = AIService()
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models
+from app.core.cache import cache, view_key
+from app.core.config import settings
+
+
+# The chat context snapshot holds what a turn needs from the database: the next 30
+# assignments' due dates and the last 5 check-ins. It is a derived view
+# (app.core.cache.DERIVED_VIEWS), dropped by any write to those through the CRUD layer.
+# Anything relative to "now" is worked out per turn, so the snapshot does not go stale as
+# time passes. The active chat session is not part of it: turns on other workers start
+# and end sessions, so it is read from the database every turn.
+
+async def _load_snapshot(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+    assignments = await crud.assignment.get_multi_by_owner_async(db=db, owner_id=user_id, limit=30)
+    moods = await crud.mood_checkin.get_multi_by_owner_async(db=db, owner_id=user_id, limit=5)
+    return {
+        "assignments": [
+            {
+                "title": getattr(a, "title", "Untitled"),
+                "due_at": getattr(a, "due_at", None),
+                "status": (getattr(a, "status", "") or "").upper(),
+                "importance_level": getattr(a, "importance_level", ""),
+            }
+            for a in assignments
+        ],
+        "mood_history": [
+            {
+                "mood_valence": getattr(m, "mood_valence", None),
+                "energy_level": getattr(m, "energy_level", None),
+                "stress_level": getattr(m, "stress_level", None),
+                "sleep_hours_last_night": getattr(m, "sleep_hours_last_night", None),
+                "created_at": getattr(m, "created_at", None).isoformat() if getattr(m, "created_at", None) else None,
+            }
+            for m in moods
+        ],
+    }
+
+
+def _snapshot_ttl() -> int:
+    # Invalidation only reaches other workers through a shared cache
+    return settings.CHAT_CONTEXT_TTL if cache.shared else settings.CHAT_CONTEXT_LOCAL_TTL
+
+
+def _context(snapshot: Dict[str, Any], user_name: Optional[str]) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    upcoming_limit = now + timedelta(days=3)
+
+    assignments = snapshot["assignments"]
+    upcoming = []
+    overdue_count = 0
+    next_item = None
+    for a in assignments:
+        due = a["due_at"]
+        if not due:
+            continue
+        try:
+            # due may be datetime; ensure comparison in UTC
+            due_dt = due if isinstance(due, datetime) else datetime.fromisoformat(str(due))
+        except Exception:
+            continue
+        if due_dt < now and a["status"] != "COMPLETED":
+            overdue_count += 1
+        if now <= due_dt <= upcoming_limit:
+            upcoming.append({
+                "title": a["title"],
+                "due_at": due_dt.isoformat(),
+                "importance_level": a["importance_level"],
+            })
+    if assignments:
+        try:
+            next_item_obj = min([a for a in assignments if a["due_at"]], key=lambda x: x["due_at"])
+            due = next_item_obj["due_at"]
+            next_item = {
+                "title": next_item_obj["title"],
+                "due_at": due.isoformat() if isinstance(due, datetime) else str(due),
+            }
+        except Exception:
+            next_item = None
+
+    return {
+        "user_name": user_name,
+        "upcoming_assignments": upcoming,
+        "overdue_count": overdue_count,
+        "next_assignment": next_item,
+        "mood_history": snapshot["mood_history"],
+    }
+
+
+async def get_chat_context(db: AsyncSession, user: models.User) -> Tuple[Dict[str, Any], Optional[int]]:
+    """The AIService chat context for `user` and their active chat session id, if any."""
+    ttl = _snapshot_ttl()
+    key = view_key("chat_context", user.id)
+    snapshot = cache.get(key) if ttl else None
+    if snapshot is None:
+        snapshot = await _load_snapshot(db, user.id)
+        if ttl:
+            cache.set(key, snapshot, ttl=ttl)
+    active_session = await crud.chat_session.get_active_async(db=db, user_id=user.id)
+    return _context(snapshot, user.full_name), active_session.id if active_session else None
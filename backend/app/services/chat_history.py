@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models
+from app.core.cache import cache
+from app.core.config import settings
+from app.services.chat_writer import chat_writer
+
+
+# Prompt history of a chat session: ChatSession.summary (everything up to
+# summary_boundary()) plus the messages after it, at most window() of them. With a shared
+# cache it is kept there and appended to as messages are saved, so a turn does not query
+# for it; the summary job drops the entry once it has folded messages in. A per-process
+# cache would miss messages saved by other workers, so without one it is loaded every turn.
+
+def window() -> int:
+    return settings.CHAT_HISTORY_MESSAGES + 2 * settings.CHAT_SUMMARY_EVERY_TURNS
+
+
+def summary_boundary(session: Optional[models.ChatSession]) -> Optional[Tuple[datetime, int]]:
+    """(created_at, id) of the last message folded into the session's summary, if any."""
+    if session is None or session.summary_message_id is None:
+        return None
+    return session.summary_message_at, session.summary_message_id
+
+
+def _key(session_id: int) -> str:
+    return f"chat:history:{session_id}"
+
+
+def _entry(role: str, content: str) -> Dict[str, str]:
+    return {"role": role, "content": content[: settings.CHAT_HISTORY_MESSAGE_CHARS]}
+
+
+async def get_history(db: AsyncSession, session_id: Optional[int]) -> Dict[str, Any]:
+    """{"summary", "messages", "unsummarized"} for the session; empty for no session."""
+    if session_id is None:
+        return {"summary": None, "messages": [], "unsummarized": 0}
+    if cache.shared:
+        history = cache.get(_key(session_id))
+        if history is not None:
+            return history
+    await chat_writer.flush()  # buffered messages must be in the database first
+    session = await crud.chat_session.get_async(db, session_id)
+    after = summary_boundary(session)
+    messages = await crud.chat_message.get_after_async(db, session_id=session_id, after=after, limit=window())
+    history = {
+        "summary": session.summary if session else None,
+        "messages": [_entry(m.role, m.content) for m in messages],
+        "unsummarized": await crud.chat_message.count_after_async(db, session_id=session_id, after=after),
+    }
+    if cache.shared:
+        cache.set(_key(session_id), history, ttl=settings.CHAT_HISTORY_TTL)
+    return history
+
+
+def record_message(history: Dict[str, Any], session_id: int, role: str, content: str) -> bool:
+    """
+    Append a saved message to this turn's `history` (from get_history) and to the cached
+    one; True when the session is due a summary.
+    """
+    if cache.shared:
+        history = cache.get(_key(session_id))
+        if history is None:
+            return False  # rebuilt from the database on the next turn
+    history.update(
+        messages=(history["messages"] + [_entry(role, content)])[-window():],
+        unsummarized=history["unsummarized"] + 1,
+    )
+    if cache.shared:
+        cache.set(_key(session_id), history, ttl=settings.CHAT_HISTORY_TTL)
+    return history["unsummarized"] >= window()
+
+
+def invalidate_history(session_id: int) -> None:
+    cache.delete(_key(session_id))
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.chat import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+class ChatMessageWriter:
+    """
+    Write-behind buffer for chat messages (CHAT_WRITE_BEHIND). Messages are queued in
+    arrival order and inserted in one bulk statement every CHAT_WRITE_BEHIND_INTERVAL_MS,
+    off the request path.
+
+    Ordering: created_at is stamped when a message is submitted, and batches are
+    inserted one at a time in submission order, so (created_at, id) within a session
+    follows the order of the turns. A failed batch stays at the head of the queue and
+    is retried. Durability: anything still queued is lost if the process dies without
+    running the app shutdown, which flushes; stats() reports how much is at risk.
+    """
+
+    def __init__(self, interval_ms: int, max_batch: int, max_pending: int):
+        self.interval = interval_ms / 1000
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._enqueued_at: Deque[float] = deque()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushed = 0
+        self._failed_flushes = 0
+        self._dropped = 0
+        self._last_lag = 0.0
+
+    def _ensure_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    def submit(self, *, session_id: int, user_id: int, role: str, content: str) -> bool:
+        """Queue a message; False when the buffer is full and the caller should insert it itself."""
+        if len(self._pending) >= self.max_pending:
+            return False
+        self._ensure_flusher()
+        self._pending.append({
+            "session_id": session_id,
+            "user_id": user_id,
+            "role": role,
+            "content": content,
+            "created_at": datetime.now(timezone.utc),
+        })
+        self._enqueued_at.append(time.monotonic())
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Chat message flush failed; %d messages pending", len(self._pending))
+
+    async def flush(self) -> None:
+        """Insert everything queued so far, in order."""
+        if self._lock is None:
+            return
+        async with self._lock:
+            while self._pending:
+                count = min(len(self._pending), self.max_batch)
+                batch: List[Dict[str, Any]] = [self._pending[i] for i in range(count)]
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(insert(ChatMessage), batch)
+                        await db.commit()
+                        self._pop(count)
+                except IntegrityError:
+                    # e.g. a session deleted meanwhile: write rows one by one and drop the
+                    # offenders, rather than block the queue behind them
+                    await self._insert_each(batch)
+                    self._pop(count)
+                except Exception:
+                    self._failed_flushes += 1
+                    raise
+
+    async def _insert_each(self, batch: List[Dict[str, Any]]) -> None:
+        for row in batch:
+            async with AsyncSessionLocal() as db:
+                try:
+                    await db.execute(insert(ChatMessage), [row])
+                    await db.commit()
+                except IntegrityError:
+                    self._dropped += 1
+                    logger.warning("Dropping chat message for session %s: integrity error", row["session_id"])
+
+    def _pop(self, count: int) -> None:
+        oldest = self._enqueued_at[0]
+        for _ in range(count):
+            self._pending.popleft()
+            self._enqueued_at.popleft()
+        self._flushed += count
+        self._last_lag = time.monotonic() - oldest
+
+    async def close(self) -> None:
+        """Stop the periodic flush and write out what is left; called on app shutdown."""
+        if self._task is not None:
+            async with self._lock:  # let a flush in progress finish first
+                self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Lost %d chat messages at shutdown", len(self._pending))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        pending: messages acknowledged to clients but not yet in the database.
+        oldest_pending_ms: how long the oldest of them has waited (the durability lag now).
+        last_flush_lag_ms: submit-to-commit time of the oldest message in the last batch.
+        """
+        oldest = self._enqueued_at[0] if self._enqueued_at else None
+        return {
+            "enabled": settings.CHAT_WRITE_BEHIND,
+            "pending": len(self._pending),
+            "oldest_pending_ms": round((time.monotonic() - oldest) * 1000, 1) if oldest is not None else 0.0,
+            "last_flush_lag_ms": round(self._last_lag * 1000, 1),
+            "flushed": self._flushed,
+            "failed_flushes": self._failed_flushes,
+            "dropped": self._dropped,
+        }
+
+
+chat_writer = ChatMessageWriter(
+    settings.CHAT_WRITE_BEHIND_INTERVAL_MS,
+    settings.CHAT_WRITE_BEHIND_MAX_BATCH,
+    settings.CHAT_WRITE_BEHIND_MAX_PENDING,
+)
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app import crud, schemas
+from app.core.cache import cache
+from app.core.config import settings
+from app.crud import crud_suggestion
+from app.db.session import AsyncSessionLocal
+from app.services.ai_service import ai_service
+from app.services.chat_history import invalidate_history, summary_boundary
+from app.services.chat_writer import chat_writer
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessQueue:
+    """
+    Bounded asyncio queue drained by a few worker tasks on the running event loop.
+    Queued jobs live only in this process and are lost on restart; use
+    JOBS_BACKEND=celery when that matters.
+    """
+
+    def __init__(self, workers: int, maxsize: int):
+        self.workers = workers
+        self.maxsize = maxsize
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    def submit(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> bool:
+        """Queue `fn(*args)`; False if the queue is full. Call from the event loop."""
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait((fn, args))
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Background queue full, dropping %s%r", fn.__name__, args)
+            return False
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            fn, args = await queue.get()
+            try:
+                await fn(*args)
+            except Exception:
+                logger.exception("Background job %s%r failed", fn.__name__, args)
+            finally:
+                queue.task_done()
+
+
+inprocess_queue = InProcessQueue(settings.JOBS_INPROCESS_WORKERS, settings.JOBS_INPROCESS_MAX_QUEUE)
+
+
+# Wellbeing suggestions are generated after each mood check-in. A pending marker (the
+# check-in id, 0 when there is none) lets GET /mood/suggestions report progress and
+# lets a job notice it was superseded by a newer check-in and skip the LLM call.
+
+def _pending_key(user_id: int) -> str:
+    return f"suggestions:pending:{user_id}"
+
+
+def suggestion_inputs(checkins: List[Any]) -> Dict[str, Any]:
+    """History and activity arguments for ai_service.wellbeing_suggestions, newest first."""
+    history = [
+        {
+            "mood_valence": m.mood_valence,
+            "energy_level": m.energy_level,
+            "stress_level": m.stress_level,
+            "sleep_hours_last_night": m.sleep_hours_last_night,
+            "additional_metrics": m.additional_metrics,
+            "created_at": m.created_at,
+        }
+        for m in checkins
+    ]
+    sleep_hrs_7 = float(sum([(m.sleep_hours_last_night or 0.0) for m in checkins]))
+    return {"mood_history": history, "activity": {"sleep_hrs_7": sleep_hrs_7, "checkins_7": len(checkins)}}
+
+
+async def generate_wellbeing_suggestions(user_id: int, mood_checkin_id: Optional[int] = None) -> None:
+    marker = mood_checkin_id or 0
+    requested = cache.get(_pending_key(user_id))
+    if requested is not None and requested != marker:
+        return  # a newer check-in queued its own job
+    try:
+        async with AsyncSessionLocal() as db:
+            recent = await crud.mood_checkin.get_multi_by_owner_async(db=db, owner_id=user_id, limit=7)
+            items = await ai_service.wellbeing_suggestions(**suggestion_inputs(recent))
+            create_items = [
+                schemas.WellbeingSuggestionCreate(title=i["title"], description=i["description"], category=i["category"])
+                for i in items
+            ]
+            await crud_suggestion.create_many_async(db, user_id=user_id, items=create_items, mood_checkin_id=mood_checkin_id)
+    finally:
+        if cache.get(_pending_key(user_id)) == marker:
+            cache.delete(_pending_key(user_id))
+
+
+def enqueue_wellbeing_suggestions(user_id: int, mood_checkin_id: Optional[int] = None) -> None:
+    """Mark suggestions pending for the user and queue their generation."""
+    cache.set(_pending_key(user_id), mood_checkin_id or 0, ttl=settings.SUGGESTIONS_PENDING_TTL)
+    if settings.JOBS_BACKEND == "celery":
+        from app.worker import generate_wellbeing_suggestions_task
+
+        generate_wellbeing_suggestions_task.delay(user_id, mood_checkin_id)
+    elif not inprocess_queue.submit(generate_wellbeing_suggestions, user_id, mood_checkin_id):
+        cache.delete(_pending_key(user_id))
+
+
+def suggestions_pending(user_id: int) -> bool:
+    return cache.get(_pending_key(user_id)) is not None
+
+
+# Rolling chat summaries: fold a session's older messages into ChatSession.summary,
+# keeping the last CHAT_HISTORY_MESSAGES out of it. One job per session at a time.
+SUMMARY_PENDING_TTL = 300
+
+
+def _summary_pending_key(session_id: int) -> str:
+    return f"chat:summary:pending:{session_id}"
+
+
+async def summarize_chat_session(session_id: int) -> None:
+    try:
+        await chat_writer.flush()
+        # Read what to fold, then give the connection back: the LLM call can take seconds
+        async with AsyncSessionLocal() as db:
+            session = await crud.chat_session.get_async(db, session_id)
+            if session is None:
+                return
+            summary, after = session.summary, summary_boundary(session)
+            messages = await crud.chat_message.get_after_async(db, session_id=session_id, after=after)
+        keep = settings.CHAT_HISTORY_MESSAGES
+        fold = messages[:-keep] if keep else messages
+        if not fold:
+            return
+        summary = await ai_service.summarize_conversation(
+            summary, [{"role": m.role, "content": m.content} for m in fold]
+        )
+        async with AsyncSessionLocal() as db:
+            stored = await crud.chat_session.set_summary_async(
+                db,
+                session_id=session_id,
+                summary=summary,
+                boundary=(fold[-1].created_at, fold[-1].id),
+                expected_message_id=after[1] if after else None,
+            )
+        if stored:
+            invalidate_history(session_id)
+    finally:
+        cache.delete(_summary_pending_key(session_id))
+
+
+def enqueue_chat_summary(session_id: int) -> None:
+    if not cache.add(_summary_pending_key(session_id), 1, ttl=SUMMARY_PENDING_TTL):
+        return  # already queued
+    if settings.JOBS_BACKEND == "celery":
+        from app.worker import summarize_chat_session_task
+
+        summarize_chat_session_task.delay(session_id)
+    elif not inprocess_queue.submit(summarize_chat_session, session_id):
+        cache.delete(_summary_pending_key(session_id))
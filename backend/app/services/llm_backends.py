@@ -0,0 +1,315 @@
+"""
+LLM backends for AIService. A backend exposes one call, `create(model=, messages=,
+stream=False, **params)`, with the OpenAI chat completions contract: it returns a
+response with `.choices[0].message.content` and `.usage`, or for stream=True an async
+iterator of chunks with `.choices[0].delta.content` (usage on the last chunk).
+
+- OpenAIBackend: the OpenAI SDK. OPENAI_BASE_URL points it at any compatible server,
+  e.g. scripts/fake_openai_server.py.
+- FakeBackend: FakeLLM in-process, for load tests without the network.
+
+FakeLLM is a deterministic stand-in: replies depend only on the request (or come from a
+recorded cassette), while latency, streaming pace and injected errors follow the
+FAKE_LLM_* settings.
+"""
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import math
+import random
+import re
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.llm_metrics import ai_metrics
+
+try:
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+try:
+    import httpx
+except ImportError:
+    try:
+        import httpx2 as httpx  # the fork newer openai releases are built on
+    except ImportError:
+        httpx = None
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+logger = logging.getLogger(__name__)
+
+
+class FakeLLMError(RuntimeError):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency distribution from a spec: "fixed:0.5", "uniform:0.2,1.5" or
+    "lognormal:<median>,<sigma>" (seconds). Returns a sampler taking an RNG.
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown latency distribution {spec!r}")
+
+
+def request_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    params = {k: v for k, v in params.items() if k not in ("stream", "stream_options")}
+    raw = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class Cassette:
+    """Recorded replies keyed by request_key, one JSON object per line."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.replies: Dict[str, str] = {}
+        if path:
+            try:
+                with open(path) as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self.replies[entry["key"]] = entry["content"]
+            except FileNotFoundError:
+                pass
+
+    def get(self, key: str) -> Optional[str]:
+        return self.replies.get(key)
+
+    def record(self, key: str, model: str, messages: List[Dict[str, str]], content: str) -> None:
+        self.replies[key] = content
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(json.dumps({"key": key, "model": model, "messages": messages, "content": content}) + "\n")
+
+
+_WORDS = (
+    "take a short break then start with the smallest next step and keep your focus on one "
+    "task at a time so the rest of the week feels lighter and more manageable for you"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _candidate_slots(prompt: str) -> List[Dict[str, str]]:
+    match = re.search(r"Candidate time slots \(you must choose from these\):\n(.*?)\n\nReturn JSON", prompt, re.S)
+    try:
+        return json.loads(match.group(1)) if match else []
+    except ValueError:
+        return []
+
+
+# Reply shapes for AIService's JSON prompts, matched on the prompt text; anything else
+# gets plain text. A prompt that changes shape without an entry here falls back to the
+# method's mock path, which shows up as fallbacks on /metrics.
+def _shape(system: str, user: str, rng: random.Random) -> Optional[Any]:
+    if "scheduling assistant" in system:
+        return {"slots": [dict(slot, reason=_text(rng, 10)) for slot in _candidate_slots(user)[:3]]}
+    if "JSON arrays" in system:
+        return [
+            {"title": _text(rng, 3), "description": _text(rng, 14), "category": rng.choice(["focus", "rest", "planning", "movement", "social"])}
+            for _ in range(rng.randint(3, 5))
+        ]
+    if "subtasks" in user:
+        return [{"title": _text(rng, 5), "estimated_minutes": rng.choice([15, 30, 45, 60, 90]), "order": i + 1} for i in range(rng.randint(5, 7))]
+    if "metrics generator" in system:
+        return {
+            "focus_level": rng.randint(1, 5), "burnout_indicator": rng.choice(["not_at_all", "a_little", "noticeable"]),
+            "productivity_confidence": rng.randint(1, 5), "workload_perception": rng.choice(["yes", "okay", "a_bit_much"]),
+            "physical_state": "fine", "social_connectedness": "yes_neutral", "stress_sources": ["deadlines"],
+            "motivation_type": "routine", "cognitive_load": rng.randint(1, 5), "emotional_intensity": rng.randint(1, 5),
+            "sleep_quality": rng.choice(["good", "okay", "poor"]), "task_aversion": "none", "free_time_confidence": "balanced",
+            "gratitude": "a quiet morning", "distraction_triggers": ["phone"],
+        }
+    if "clean_text" in system:
+        return {"clean_text": " ".join(user.split("RAW:", 1)[-1].split()), "suggested_title": _text(rng, 4)}
+    if "valid JSON" in system:
+        return {"insight": _text(rng, 16), "recommendation": _text(rng, 12)}
+    return None
+
+
+def _usage(messages: List[Dict[str, str]], content: str) -> SimpleNamespace:
+    # Roughly four characters per token, as with English text
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+    completion_tokens = max(len(content) // 4, 1)
+    return SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=prompt_tokens + completion_tokens)
+
+
+class FakeLLM:
+    """Deterministic replies with simulated latency, streaming and errors."""
+
+    def __init__(
+        self,
+        latency: Optional[str] = None,
+        token_delay_ms: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        rate_limit_rate: Optional[float] = None,
+        hang_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+        cassette: Optional[str] = None,
+    ):
+        self.sample_latency = parse_latency(latency or settings.FAKE_LLM_LATENCY)
+        self.token_delay = (settings.FAKE_LLM_TOKEN_DELAY_MS if token_delay_ms is None else token_delay_ms) / 1000
+        self.error_rate = settings.FAKE_LLM_ERROR_RATE if error_rate is None else error_rate
+        self.rate_limit_rate = settings.FAKE_LLM_RATE_LIMIT_RATE if rate_limit_rate is None else rate_limit_rate
+        self.hang_rate = settings.FAKE_LLM_HANG_RATE if hang_rate is None else hang_rate
+        self.rng = random.Random(settings.FAKE_LLM_SEED if seed is None else seed)
+        self.cassette = Cassette(cassette if cassette is not None else settings.FAKE_LLM_CASSETTE)
+
+    def reply(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        key = request_key(model, messages, params)
+        recorded = self.cassette.get(key)
+        if recorded is not None:
+            return recorded
+        rng = random.Random(key)
+        system = " ".join(m["content"] for m in messages if m["role"] == "system")
+        user = " ".join(m["content"] for m in messages if m["role"] == "user")
+        shaped = _shape(system, user, rng)
+        if shaped is not None:
+            return json.dumps(shaped)
+        max_words = max(int((params.get("max_tokens") or 200) * 0.75), 5)
+        return _text(rng, min(rng.randint(20, 60), max_words))
+
+    async def plan(self) -> Tuple[float, Optional[FakeLLMError]]:
+        """Time to first token for the next call and the error to inject, if any."""
+        roll = self.rng.random()
+        if roll < self.hang_rate:
+            await asyncio.sleep(3600)
+        roll -= self.hang_rate
+        error = None
+        if roll < self.error_rate:
+            error = FakeLLMError(500, "Injected upstream error")
+        elif roll < self.error_rate + self.rate_limit_rate:
+            error = FakeLLMError(429, "Injected rate limit")
+        return self.sample_latency(self.rng), error
+
+    @staticmethod
+    def split(content: str) -> List[str]:
+        """Stream pieces of about one token each."""
+        return re.findall(r"\s*\S+", content) or [content]
+
+
+async def _trace_connections(request: Any) -> None:
+    """httpx request hook: count requests on reused vs new connections, and TLS handshakes."""
+    connected = False
+
+    async def trace(event: str, info: Dict[str, Any]) -> None:
+        nonlocal connected
+        if event == "connection.connect_tcp.complete":
+            connected = True
+        elif event == "connection.start_tls.complete":
+            ai_metrics.record_tls_handshake()
+        elif event.endswith(".send_request_headers.started"):
+            ai_metrics.record_connection(reused=not connected)
+
+    request.extensions["trace"] = trace
+
+
+def build_http_client() -> Any:
+    """
+    The one HTTP client behind AsyncOpenAI: keep-alive pool sized for the scheduler's
+    concurrency, HTTP/2 when h2 is installed, and connect/read timeouts from Settings.
+    """
+    return DefaultAsyncHttpxClient(
+        http2=settings.OPENAI_HTTP2 and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.OPENAI_READ_TIMEOUT,
+            connect=settings.OPENAI_CONNECT_TIMEOUT,
+            pool=settings.OPENAI_CONNECT_TIMEOUT,
+        ),
+        event_hooks={"request": [_trace_connections]},
+    )
+
+
+class OpenAIBackend:
+    def __init__(self):
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            http_client=build_http_client() if httpx is not None else None,
+        )
+
+    async def create(self, **kwargs: Any) -> Any:
+        return await self.client.chat.completions.create(**kwargs)
+
+    async def warm_up(self) -> None:
+        """Open OPENAI_WARMUP_CONNECTIONS pooled connections (TCP + TLS) before the first user call."""
+        if settings.OPENAI_WARMUP_CONNECTIONS <= 0:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(self.client.models.list() for _ in range(settings.OPENAI_WARMUP_CONNECTIONS))),
+                timeout=settings.OPENAI_CONNECT_TIMEOUT * 2,
+            )
+        except Exception as e:
+            logger.warning("OpenAI connection warm-up failed: %s", e)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class FakeBackend:
+    def __init__(self, llm: Optional[FakeLLM] = None):
+        self.llm = llm or FakeLLM()
+
+    async def warm_up(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def create(self, *, model: str, messages: List[Dict[str, str]], stream: bool = False, **params: Any) -> Any:
+        ttft, error = await self.llm.plan()
+        await asyncio.sleep(ttft)
+        if error is not None:
+            raise error
+        content = self.llm.reply(model, messages, params)
+        if stream:
+            return self._stream(model, messages, content)
+        await asyncio.sleep(self.llm.token_delay * len(self.llm.split(content)))
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=_usage(messages, content),
+        )
+
+    async def _stream(self, model: str, messages: List[Dict[str, str]], content: str) -> AsyncIterator[Any]:
+        for i, piece in enumerate(self.llm.split(content)):
+            if i:
+                await asyncio.sleep(self.llm.token_delay)
+            yield SimpleNamespace(model=model, choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=piece))], usage=None)
+        yield SimpleNamespace(model=model, choices=[], usage=_usage(messages, content))
+
+
+def build_backend():
+    """The configured backend, or None when AIService should run in mock mode."""
+    if settings.LLM_BACKEND == "fake":
+        return FakeBackend()
+    if OPENAI_AVAILABLE and settings.OPENAI_API_KEY is not None:
+        return OpenAIBackend()
+    return None
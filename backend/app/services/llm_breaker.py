@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+
+class LLMCircuitOpen(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Error rate and latency of one (model, method) over a sliding window.
+
+    closed: calls go through. Once the window holds at least LLM_BREAKER_MIN_CALLS
+    outcomes and the failure share reaches LLM_BREAKER_ERROR_RATE the breaker opens,
+    and before_call() raises LLMCircuitOpen so the caller falls back without waiting
+    on the upstream. After LLM_BREAKER_COOLDOWN_SECONDS one probe call is let through
+    (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, method: str):
+        self.method = method
+        self.state = "closed"
+        self.opened_at = 0.0
+        self._probing = False
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._latencies = LatencyStats(window=200)
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float) -> None:
+        horizon = now - settings.LLM_BREAKER_WINDOW_SECONDS
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= settings.LLM_BREAKER_COOLDOWN_SECONDS:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return
+            raise LLMCircuitOpen(f"LLM circuit open for {self.method}")
+
+    def record_success(self, seconds: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._outcomes.append((now, True))
+            self._latencies.observe(seconds)
+            self._trim(now)
+            if self.state == "half_open":
+                self.state = "closed"
+                self._outcomes.clear()
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._outcomes.append((now, False))
+            self._trim(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if self.state == "half_open" or (
+                len(self._outcomes) >= settings.LLM_BREAKER_MIN_CALLS
+                and failures / len(self._outcomes) >= settings.LLM_BREAKER_ERROR_RATE
+            ):
+                self.state = "open"
+                self.opened_at = now
+            self._probing = False
+
+    def abandon(self) -> None:
+        """The call was cancelled by its caller: no outcome, but free the probe."""
+        with self._lock:
+            self._probing = False
+
+    def timeout(self) -> float:
+        """Seconds to allow the next call, from the observed p95 of successful calls."""
+        ceiling = settings.LLM_TIMEOUT_CEILINGS.get(self.method, settings.LLM_TIMEOUT_CEILING)
+        if self._latencies.count < settings.LLM_TIMEOUT_MIN_SAMPLES:
+            return min(settings.LLM_TIMEOUT_DEFAULT, ceiling)
+        p95 = self._latencies.percentile(0.95)
+        return min(max(p95 * settings.LLM_TIMEOUT_P95_MULTIPLIER, settings.LLM_TIMEOUT_FLOOR), ceiling)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            self._trim(time.monotonic())
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            state = self.state
+        sampled = self._latencies.count > 0
+        return {
+            "state": state,
+            "calls": len(self._outcomes),
+            "failures": failures,
+            "p50_ms": round(self._latencies.percentile(0.5) * 1000, 3) if sampled else None,
+            "p95_ms": round(self._latencies.percentile(0.95) * 1000, 3) if sampled else None,
+            "timeout_s": round(self.timeout(), 3),
+        }
+
+
+class BreakerRegistry:
+    def __init__(self):
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str, method: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get((model, method))
+            if breaker is None:
+                breaker = self._breakers[(model, method)] = CircuitBreaker(method)
+            return breaker
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {f"{model}:{method}": breaker.snapshot() for (model, method), breaker in breakers}
+
+
+llm_breakers = BreakerRegistry()
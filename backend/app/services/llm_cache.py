@@ -0,0 +1,65 @@
+import hashlib
+import json
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import MemoryCache, RedisCache
+from app.core.config import settings
+
+
+def _normalize(text: str) -> str:
+    # Pasted briefs often differ only in line breaks and indentation
+    return " ".join(text.split())
+
+
+class LLMCache:
+    """
+    Cache of LLM completions keyed on a hash of (method, model, messages, params).
+    Methods opt in through settings.LLM_CACHE_TTLS; hits and misses are counted per method.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._stats: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(method: str, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        payload = {
+            "method": method,
+            "model": model,
+            "messages": [{"role": m["role"], "content": _normalize(m["content"])} for m in messages],
+            "params": params,
+        }
+        raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, method: str, key: str) -> Optional[str]:
+        value = self.backend.get(key)
+        self._count(method, "hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.backend.set(key, value, ttl=ttl)
+
+    def _count(self, method: str, outcome: str) -> None:
+        with self._lock:
+            self._stats.setdefault(method, Counter())[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hits and misses per method since this worker started."""
+        with self._lock:
+            return {method: {"hits": c["hits"], "misses": c["misses"]} for method, c in self._stats.items()}
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def _build_backend():
+    if settings.LLM_CACHE_BACKEND == "shared" and settings.REDIS_URL:
+        return RedisCache(settings.REDIS_URL, prefix="assignwell:llm:")
+    return MemoryCache(maxsize=settings.LLM_CACHE_MAX_ENTRIES)
+
+
+llm_cache = LLMCache(_build_backend())
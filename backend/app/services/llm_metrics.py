@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+
+# Time from issuing a streamed chat call to its first token
+chat_ttft = LatencyStats()
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count, as in a Prometheus histogram."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+
+    def samples(self) -> Tuple[List[Tuple[float, int]], int, float]:
+        with self._lock:
+            return list(zip(self.buckets, self.counts)), self.count, self.sum
+
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+COST_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """USD for one call from settings.LLM_PRICES; None for a model without a price."""
+    price = settings.LLM_PRICES.get(model)
+    if price is None:
+        return None
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+class AIMetrics:
+    """
+    Per-method telemetry for AIService: upstream latency by outcome (ok, error, timeout),
+    prompt/completion tokens and estimated cost as histograms, plus calls and fallbacks
+    to mock output. Values are for this worker process only.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._calls: Counter = Counter()
+        self._fallbacks: Counter = Counter()
+        self._connections: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _histogram(self, name: str, method: str, buckets: Tuple[float, ...], outcome: str = "") -> Histogram:
+        with self._lock:
+            histogram = self._histograms.get((name, method, outcome))
+            if histogram is None:
+                histogram = self._histograms[(name, method, outcome)] = Histogram(buckets)
+            return histogram
+
+    def record_call(self, method: str) -> None:
+        with self._lock:
+            self._calls[method] += 1
+
+    def record_fallback(self, method: str) -> None:
+        with self._lock:
+            self._fallbacks[method] += 1
+
+    def record_connection(self, reused: bool) -> None:
+        with self._lock:
+            self._connections["reused" if reused else "new"] += 1
+
+    def record_tls_handshake(self) -> None:
+        with self._lock:
+            self._connections["tls_handshakes"] += 1
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Requests to the LLM API sent on a reused vs a newly opened connection, and TLS handshakes."""
+        with self._lock:
+            return {key: self._connections[key] for key in ("reused", "new", "tls_handshakes")}
+
+    def observe_response(self, method: str, model: str, seconds: float, usage: Any) -> None:
+        self._histogram("latency_seconds", method, LATENCY_BUCKETS, "ok").observe(seconds)
+        if usage is None:
+            return
+        prompt = getattr(usage, "prompt_tokens", 0) or 0
+        completion = getattr(usage, "completion_tokens", 0) or 0
+        self._histogram("prompt_tokens", method, TOKEN_BUCKETS).observe(prompt)
+        self._histogram("completion_tokens", method, TOKEN_BUCKETS).observe(completion)
+        cost = estimate_cost(model, prompt, completion)
+        if cost is not None:
+            self._histogram("cost_usd", method, COST_BUCKETS).observe(cost)
+
+    def observe_failure(self, method: str, seconds: float, error: BaseException) -> None:
+        """Latency of a call that raised: the slow tail that a success-only histogram hides."""
+        outcome = "timeout" if isinstance(error, (TimeoutError, asyncio.TimeoutError)) else "error"
+        self._histogram("latency_seconds", method, LATENCY_BUCKETS, outcome).observe(seconds)
+
+    def render(self, cache_stats: Dict[str, Dict[str, int]]) -> str:
+        """Everything above plus cache hits/misses per method, in Prometheus text format."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            calls = dict(self._calls)
+            fallbacks = dict(self._fallbacks)
+        lines: List[str] = []
+        described = set()
+        for (name, method, outcome), histogram in histograms:
+            metric = f"assignwell_llm_{name}"
+            if metric not in described:
+                described.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            labels = f'method="{method}"' + (f',outcome="{outcome}"' if outcome else "")
+            buckets, count, total = histogram.samples()
+            for bound, n in buckets:
+                lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {n}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{{labels}}} {total:g}')
+            lines.append(f'{metric}_count{{{labels}}} {count}')
+        counters = (
+            ("assignwell_llm_calls_total", calls),
+            ("assignwell_llm_fallbacks_total", fallbacks),
+            ("assignwell_llm_cache_hits_total", {m: s["hits"] for m, s in cache_stats.items()}),
+            ("assignwell_llm_cache_misses_total", {m: s["misses"] for m, s in cache_stats.items()}),
+        )
+        for metric, values in counters:
+            lines.append(f"# TYPE {metric} counter")
+            for method, value in sorted(values.items()):
+                lines.append(f'{metric}{{method="{method}"}} {value}')
+        connections = self.connection_stats()
+        lines.append("# TYPE assignwell_llm_http_requests_total counter")
+        for kind in ("reused", "new"):
+            lines.append(f'assignwell_llm_http_requests_total{{connection="{kind}"}} {connections[kind]}')
+        lines.append("# TYPE assignwell_llm_tls_handshakes_total counter")
+        lines.append(f"assignwell_llm_tls_handshakes_total {connections['tls_handshakes']}")
+        return "\n".join(lines) + "\n"
+
+
+ai_metrics = AIMetrics()
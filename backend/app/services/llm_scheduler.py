@@ -0,0 +1,124 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    CHAT = 0          # interactive chat replies (2 s budget)
+    INTERACTIVE = 1   # other request-path calls: slot ranking, plans, extraction, mood insight
+    SUGGESTIONS = 2   # background-ish: wellbeing suggestions, inferred metrics
+    SUMMARIES = 3     # conversation summaries
+
+
+class LLMQueueFull(RuntimeError):
+    pass
+
+
+class _ModelLane:
+    """Concurrency slots for one model, handed to waiters in priority order."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.queued: Counter = Counter()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def _cap(self, priority: Priority) -> int:
+        # Background classes never take the last LLM_RESERVED_SLOTS, so a chat reply
+        # does not have to wait behind a burst of suggestion calls.
+        if priority >= Priority.SUGGESTIONS:
+            return max(self.limit - settings.LLM_RESERVED_SLOTS, 1)
+        return self.limit
+
+    async def acquire(self, priority: Priority) -> None:
+        if self.active < self._cap(priority):
+            self.active += 1
+            return
+        if self.queued[priority] >= settings.LLM_MAX_QUEUED[priority.name.lower()]:
+            raise LLMQueueFull(f"LLM queue for {priority.name.lower()} calls is full")
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        self.queued[priority] += 1
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # the slot was handed over just as we were cancelled
+            else:
+                fut.cancel()
+                self.queued[priority] -= 1
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        while self._waiters:
+            priority, _, fut = self._waiters[0]
+            if fut.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            if self.active >= self._cap(Priority(priority)):
+                break
+            heapq.heappop(self._waiters)
+            self.queued[priority] -= 1
+            self.active += 1
+            fut.set_result(None)
+
+
+class LLMScheduler:
+    """
+    Front door for LLM calls: at most LLM_CONCURRENCY concurrent requests per model
+    (LLM_DEFAULT_CONCURRENCY otherwise), queued by Priority with a depth limit per
+    class; a full queue raises LLMQueueFull instead of waiting. Queue wait is recorded.
+    """
+
+    def __init__(self):
+        self._lanes: Dict[str, _ModelLane] = {}
+        self._waits: Dict[Priority, LatencyStats] = {priority: LatencyStats() for priority in Priority}
+        self._rejected: Counter = Counter()
+
+    def _lane(self, model: str) -> _ModelLane:
+        lane = self._lanes.get(model)
+        if lane is None:
+            limit = settings.LLM_CONCURRENCY.get(model, settings.LLM_DEFAULT_CONCURRENCY)
+            lane = self._lanes[model] = _ModelLane(limit)
+        return lane
+
+    @asynccontextmanager
+    async def slot(self, model: str, priority: Priority) -> AsyncIterator[None]:
+        lane = self._lane(model)
+        start = time.perf_counter()
+        try:
+            await lane.acquire(priority)
+        except LLMQueueFull:
+            self._rejected[priority] += 1
+            raise
+        self._waits[priority].observe(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            lane.release()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            "models": {
+                model: {"limit": lane.limit, "active": lane.active, "queued": sum(lane.queued.values())}
+                for model, lane in self._lanes.items()
+            },
+            "queue_wait": {
+                priority.name.lower(): {**self._waits[priority].snapshot(), "rejected": self._rejected[priority]}
+                for priority in Priority
+            },
+        }
+
+
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,58 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls: the first caller for a key starts the work as
+    a task and later callers await that same task until it finishes.
+
+    The task belongs to no single caller. A caller that is cancelled (e.g. the client
+    disconnected) just stops waiting; the task is only cancelled once nobody is waiting.
+    An exception is raised to every waiter and nothing is remembered afterwards, so the
+    next call retries.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Tuple[asyncio.Task, list]] = {}
+        self._coalesced: Counter = Counter()
+
+    async def do(self, method: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(fn())
+            entry = (task, [0])
+            self._inflight[key] = entry
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self._coalesced[method] += 1
+        task, waiters = entry
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and waiters[0] == 1:
+                # Forget it now, not when the task finishes unwinding, so a caller arriving
+                # in between starts a fresh call instead of joining a cancelled one
+                self._forget(key, task)
+                task.cancel()
+            raise
+        finally:
+            waiters[0] -= 1
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        self._forget(key, task)
+        if not task.cancelled():
+            task.exception()  # retrieved here so an unawaited failure is not logged as lost
+
+    def stats(self) -> Dict[str, int]:
+        """Calls per method that joined an in-flight request instead of making their own."""
+        return dict(self._coalesced)
+
+
+llm_flights = SingleFlight()
@@ -0,0 +1,43 @@
+"""
+Celery worker for background jobs, used when JOBS_BACKEND=celery:
+
+    celery -A app.worker worker --loglevel=info
+
+The broker is CELERY_BROKER_URL, or REDIS_URL when that is unset. REDIS_URL is required
+(settings refuse JOBS_BACKEND=celery without it): the API and the worker share the
+"pending" markers through that cache.
+"""
+import asyncio
+
+from celery import Celery
+
+from app.core.config import settings
+from app.services import jobs
+
+celery_app = Celery("assignwell", broker=settings.CELERY_BROKER_URL or settings.REDIS_URL)
+celery_app.conf.update(
+    task_acks_late=True,
+    task_ignore_result=True,
+    worker_prefetch_multiplier=1,
+)
+
+# One event loop per worker process, reused across tasks so the async engine's pooled
+# connections stay bound to the loop that created them.
+_loop = None
+
+
+def _run(coro):
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+@celery_app.task(name="suggestions.generate")
+def generate_wellbeing_suggestions_task(user_id: int, mood_checkin_id=None) -> None:
+    _run(jobs.generate_wellbeing_suggestions(user_id, mood_checkin_id))
+
+
+@celery_app.task(name="chat.summarize")
+def summarize_chat_session_task(session_id: int) -> None:
+    _run(jobs.summarize_chat_session(session_id))
@@ -0,0 +1,90 @@
+"""
+Compare response serialization paths for a 500-row list endpoint (Assignment rows):
+
+  * legacy        - response_class=JSONResponse: field.serialize() to Python, then json.dumps
+  * orjson        - response_class=ORJSONResponse: field.serialize() to Python, then orjson
+  * response_model- FastAPI default: validate from ORM attributes, Pydantic dump_json
+  * json_list     - app.api.responses.json_list: cached TypeAdapter fed from the instance dict
+
+    python scripts/bench_json.py [--rows 500] [--requests 200]
+"""
+from pathlib import Path
+import sys
+import argparse
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+warnings.simplefilter("ignore")  # ORJSONResponse deprecation, pydantic Config warnings
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app import schemas
+from app.api.responses import json_list
+from app.models.assignment import Assignment, AssignmentStatus, DifficultyLevel, SourceType
+import app.models  # noqa: F401
+
+
+def make_rows(n: int) -> List[Assignment]:
+    now = datetime.now(timezone.utc)
+    return [
+        Assignment(
+            id=i, user_id=1, title=f"Assignment {i}", description="Read chapters 3-5 and summarize. " * 4,
+            due_at=now, estimated_minutes=90, difficulty=DifficultyLevel.MEDIUM, status=AssignmentStatus.NOT_STARTED, source_type=SourceType.MANUAL,
+            is_group=False, ai_generated_plan=False, created_at=now, subtasks=[],
+        )
+        for i in range(n)
+    ]
+
+
+def make_app(rows: List[Assignment]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy", response_model=List[schemas.Assignment], response_class=JSONResponse)
+    def legacy():
+        return rows
+
+    @app.get("/orjson", response_model=List[schemas.Assignment], response_class=ORJSONResponse)
+    def orjson_route():
+        return rows
+
+    @app.get("/response_model", response_model=List[schemas.Assignment])
+    def response_model():
+        return rows
+
+    @app.get("/json_list", response_model=List[schemas.Assignment])
+    def json_list_route():
+        return json_list(schemas.Assignment, rows)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    client = TestClient(make_app(make_rows(args.rows)))
+    bodies = {}
+    for path in ("/legacy", "/orjson", "/response_model", "/json_list"):
+        for _ in range(10):  # warm up (adapter compilation, imports)
+            client.get(path)
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            response = client.get(path)
+        elapsed = time.perf_counter() - start
+        bodies[path] = response.json()
+        print(
+            f"{path:16s} {elapsed * 1000 / args.requests:7.2f} ms/req  "
+            f"{args.requests / elapsed:7.1f} req/s  {len(response.content) / 1024:.0f} KiB"
+        )
+    assert all(body == bodies["/legacy"] for body in bodies.values()), "serializers disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measure password verification throughput (one login = one pbkdf2_sha256 verify) at the
+configured cost, single-threaded and through the bounded hashing pool, and report
+logins/sec per core.
+
+    python scripts/bench_password_hashing.py [--rounds 29000] [--seconds 3]
+"""
+from pathlib import Path
+import sys
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core import security
+
+
+def measure(verify, seconds: float, workers: int) -> float:
+    """Run `verify` from `workers` client threads for `seconds`; returns verifications/sec."""
+    deadline = time.perf_counter() + seconds
+
+    def client() -> int:
+        n = 0
+        while time.perf_counter() < deadline:
+            verify()
+            n += 1
+        return n
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as clients:
+        total = sum(clients.map(lambda _: client(), range(workers)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=settings.PASSWORD_HASH_ROUNDS)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    context = CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__default_rounds=args.rounds)
+    stored = context.hash("correct horse battery staple")
+    cores = os.cpu_count() or 1
+    pool_size = security._hash_executor._max_workers
+
+    inline = measure(lambda: context.verify("correct horse battery staple", stored), args.seconds, 1)
+    print(f"rounds={args.rounds}  cores={cores}  pool={pool_size}")
+    print(f"inline, 1 thread      {inline:8.1f} logins/s  ({1000 / inline:.1f} ms each)")
+
+    # Many concurrent requests funnelled through the shared pool, as in a login burst
+    def pooled():
+        security._hash_executor.submit(context.verify, "correct horse battery staple", stored).result()
+
+    burst = measure(pooled, args.seconds, pool_size * 4)
+    print(f"pool, {pool_size * 4:3d} clients     {burst:8.1f} logins/s  ({burst / cores:.1f} per core)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Local OpenAI-compatible chat completions server backed by FakeLLM, for load testing
+the AI-bound endpoints (/chat/ask, /goals/{id}/suggest-times, /mood/) offline and
+through the real OpenAI client, connection pool and retries.
+
+    python scripts/fake_openai_server.py --port 9100 --latency lognormal:0.6,0.4 \
+        --token-delay-ms 15 --error-rate 0.02 --seed 1
+
+Then run the API with OPENAI_API_KEY=fake OPENAI_BASE_URL=http://localhost:9100/v1.
+
+Cassettes: --cassette FILE serves recorded replies before synthesizing one. With
+--record, requests missing from the cassette are sent to the real API (OPENAI_API_KEY
+in this process's environment, --upstream for another base URL) and appended to it;
+use --latency fixed:0 while recording to avoid adding simulated latency.
+"""
+from pathlib import Path
+import sys
+import argparse
+import json
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.services.llm_backends import FakeBackend, FakeLLM, FakeLLMError, request_key
+
+
+def completion_body(response: Any) -> Dict[str, Any]:
+    choice = response.choices[0]
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": response.model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": choice.message.content},
+            "finish_reason": choice.finish_reason,
+        }],
+        "usage": vars(response.usage),
+    }
+
+
+async def sse(chunks: AsyncIterator[Any], include_usage: bool) -> AsyncIterator[bytes]:
+    chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    def event(model: str, choices: list, usage: Any = None) -> bytes:
+        body = {"id": chunk_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": choices}
+        if usage is not None:
+            body["usage"] = vars(usage)
+        return f"data: {json.dumps(body)}\n\n".encode()
+
+    async for chunk in chunks:
+        if chunk.choices:
+            yield event(chunk.model, [{"index": 0, "delta": {"content": chunk.choices[0].delta.content}, "finish_reason": None}])
+        else:
+            yield event(chunk.model, [{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if include_usage:
+                yield event(chunk.model, [], chunk.usage)
+    yield b"data: [DONE]\n\n"
+
+
+def create_app(llm: FakeLLM, record: bool = False, upstream: str = None) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    backend = FakeBackend(llm)
+    client = None
+    if record:
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"), base_url=upstream)
+
+    @app.get("/v1/models")
+    async def models():
+        # AIService warms its connection pool with this at startup
+        return {"object": "list", "data": [{"id": "fake", "object": "model", "created": 0, "owned_by": "fake"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.pop("model")
+        messages = body.pop("messages")
+        stream = body.pop("stream", False)
+        include_usage = bool((body.pop("stream_options", None) or {}).get("include_usage"))
+
+        if client is not None:
+            key = request_key(model, messages, body)
+            if llm.cassette.get(key) is None:
+                real = await client.chat.completions.create(model=model, messages=messages, **body)
+                llm.cassette.record(key, model, messages, real.choices[0].message.content or "")
+
+        try:
+            result = await backend.create(model=model, messages=messages, stream=stream, **body)
+        except FakeLLMError as e:
+            return JSONResponse(
+                status_code=e.status_code,
+                content={"error": {"message": str(e), "type": "server_error" if e.status_code >= 500 else "rate_limit_error"}},
+            )
+        if stream:
+            return StreamingResponse(sse(result, include_usage), media_type="text/event-stream")
+        return completion_body(result)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", help="time to first token, e.g. fixed:0.5, uniform:0.2,1.5, lognormal:0.6,0.4")
+    parser.add_argument("--token-delay-ms", type=float)
+    parser.add_argument("--error-rate", type=float, help="share of calls answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, help="share of calls answered with a 429")
+    parser.add_argument("--hang-rate", type=float, help="share of calls that never answer")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--cassette")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--upstream", help="base URL of the API to record from")
+    args = parser.parse_args()
+
+    llm = FakeLLM(
+        latency=args.latency,
+        token_delay_ms=args.token_delay_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        hang_rate=args.hang_rate,
+        seed=args.seed,
+        cassette=args.cassette,
+    )
+    if args.record and not args.cassette:
+        parser.error("--record needs --cassette")
+    uvicorn.run(create_app(llm, args.record, args.upstream), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.db.base import Base
+from app.models.assignment import Assignment
+from app.models.chat import ChatSession
+from app.models.user import User
+from app.services import chat_context as chat_context_module
+from app.services.chat_context import get_chat_context
+
+
+@pytest.fixture
+def worker_cache(monkeypatch):
+    # The per-process cache every worker gets without REDIS_URL
+    local = MemoryCache()
+    monkeypatch.setattr(chat_context_module, "cache", local)
+    return local
+
+
+def run_turns(tmp_path, *writes_between_turns):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as db:
+            user = User(id=1, email="context@example.com", hashed_password="x", full_name="Sam")
+            db.add(user)
+            await db.commit()
+            seen = [await get_chat_context(db, user)]
+            for write in writes_between_turns:
+                async with factory() as other_worker:
+                    write(other_worker)
+                    await other_worker.commit()
+                seen.append(await get_chat_context(db, user))
+        await engine.dispose()
+        return seen
+
+    return asyncio.run(scenario())
+
+
+def start_session(db):
+    db.add(ChatSession(id=7, user_id=1))
+
+
+def add_assignment(db):
+    db.add(Assignment(id=1, user_id=1, title="Essay", due_at=datetime(2030, 1, 1)))
+
+
+def test_active_session_started_on_another_worker_is_seen(tmp_path, worker_cache):
+    (_, before), (_, after) = run_turns(tmp_path, start_session)
+    assert (before, after) == (None, 7)
+
+
+def test_snapshot_is_not_kept_in_a_per_process_cache(tmp_path, worker_cache):
+    (before, _), (after, _) = run_turns(tmp_path, add_assignment)
+    assert before["next_assignment"] is None
+    assert after["next_assignment"]["title"] == "Essay"
+
+
+def test_snapshot_is_kept_in_a_shared_cache(tmp_path, worker_cache, monkeypatch):
+    monkeypatch.setattr(worker_cache, "shared", True)
+    monkeypatch.setattr(settings, "CHAT_CONTEXT_TTL", 600)
+    # Reused until a write through the CRUD layer drops it; the session is still read live
+    (before, _), (after, session_id) = run_turns(tmp_path, lambda db: (add_assignment(db), start_session(db)))
+    assert before["next_assignment"] is after["next_assignment"] is None
+    assert session_id == 7
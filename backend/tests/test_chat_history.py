@@ -0,0 +1,152 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.crud.crud_chat import chat_message
+from app.db.base import Base
+from app.models.chat import ChatMessage, ChatSession
+from app.models.user import User
+from app.services import chat_history as chat_history_module, jobs
+from app.services.chat_history import get_history, record_message, summary_boundary
+
+
+def test_messages_after_the_summary_follow_created_at_not_id(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as db:
+            db.add(User(id=1, email="history@example.com", hashed_password="x"))
+            db.add(ChatSession(id=1, user_id=1))
+            # Two workers flushing buffered messages: id 3 was written first but inserted last
+            db.add_all([
+                ChatMessage(id=1, session_id=1, user_id=1, role="user", content="a", created_at=datetime(2026, 1, 5, 9, 0, 1)),
+                ChatMessage(id=2, session_id=1, user_id=1, role="user", content="c", created_at=datetime(2026, 1, 5, 9, 0, 3)),
+                ChatMessage(id=3, session_id=1, user_id=1, role="assistant", content="b", created_at=datetime(2026, 1, 5, 9, 0, 2)),
+            ])
+            await db.commit()
+
+            messages = await chat_message.get_after_async(db, session_id=1, after=None)
+            assert [m.content for m in messages] == ["a", "b", "c"]
+
+            # Fold the first two into the summary, as jobs.summarize_chat_session does
+            session = await db.get(ChatSession, 1)
+            session.summary_message_at, session.summary_message_id = messages[1].created_at, messages[1].id
+            await db.commit()
+
+            after = summary_boundary(session)
+            rest = await chat_message.get_after_async(db, session_id=1, after=after)
+            count = await chat_message.count_after_async(db, session_id=1, after=after)
+        await engine.dispose()
+        return [m.content for m in rest], count
+
+    assert asyncio.run(scenario()) == (["c"], 1)
+
+
+@pytest.fixture
+def chat_db(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}")
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as db:
+            db.add(User(id=1, email="history@example.com", hashed_password="x"))
+            db.add(ChatSession(id=1, user_id=1))
+            await db.commit()
+
+    asyncio.run(setup())
+    monkeypatch.setattr(chat_history_module, "cache", MemoryCache())  # per process, not shared
+    monkeypatch.setattr(jobs, "cache", MemoryCache())
+    monkeypatch.setattr(jobs, "AsyncSessionLocal", factory)
+    monkeypatch.setattr(settings, "CHAT_HISTORY_MESSAGES", 1)
+    monkeypatch.setattr(settings, "CHAT_SUMMARY_EVERY_TURNS", 1)  # window() == 3
+    yield engine, factory
+    asyncio.run(engine.dispose())
+
+
+async def save(factory, *contents):
+    async with factory() as db:
+        for content in contents:
+            await chat_message.create_for_session_async(db, session_id=1, user_id=1, role="user", content=content)
+
+
+def test_history_sees_messages_saved_by_other_workers(chat_db):
+    engine, factory = chat_db
+
+    async def scenario():
+        async with factory() as db:
+            first = await get_history(db, 1)
+            assert not record_message(first, 1, "user", "mine")  # this worker's turn
+            await save(factory, "mine", "theirs")  # another worker's turn lands too
+            second = await get_history(db, 1)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert (first["messages"], first["unsummarized"]) == ([{"role": "user", "content": "mine"}], 1)
+    assert [m["content"] for m in second["messages"]] == ["mine", "theirs"]
+    assert second["unsummarized"] == 2
+
+
+def test_summary_is_due_once_the_window_is_unsummarized(chat_db):
+    engine, factory = chat_db
+
+    async def scenario():
+        await save(factory, "a", "b")
+        async with factory() as db:
+            history = await get_history(db, 1)
+        return record_message(history, 1, "assistant", "c")
+
+    assert asyncio.run(scenario())
+
+
+def test_summary_job_holds_no_connection_during_the_llm_call(chat_db, monkeypatch):
+    engine, factory = chat_db
+    checked_out = []
+
+    async def summarize(summary, messages):
+        checked_out.append(engine.sync_engine.pool.checkedout())
+        return "summary of " + ", ".join(m["content"] for m in messages)
+
+    monkeypatch.setattr(jobs.ai_service, "summarize_conversation", summarize)
+
+    async def scenario():
+        await save(factory, "a", "b", "c")
+        await jobs.summarize_chat_session(1)
+        async with factory() as db:
+            return await db.get(ChatSession, 1)
+
+    session = asyncio.run(scenario())
+    assert checked_out == [0]
+    assert (session.summary, session.summary_message_id) == ("summary of a, b", 2)
+
+
+def test_summary_job_does_not_overwrite_a_boundary_that_moved(chat_db, monkeypatch):
+    engine, factory = chat_db
+
+    async def summarize(summary, messages):
+        # Another job folds the first message in while this one waits on the LLM
+        async with factory() as db:
+            first = (await chat_message.get_after_async(db, session_id=1, after=None))[0]
+            session = await db.get(ChatSession, 1)
+            session.summary = "theirs"
+            session.summary_message_at, session.summary_message_id = first.created_at, first.id
+            await db.commit()
+        return "mine"
+
+    monkeypatch.setattr(jobs.ai_service, "summarize_conversation", summarize)
+
+    async def scenario():
+        await save(factory, "a", "b", "c")
+        await jobs.summarize_chat_session(1)
+        async with factory() as db:
+            return await db.get(ChatSession, 1)
+
+    session = asyncio.run(scenario())
+    assert (session.summary, session.summary_message_id) == ("theirs", 1)
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models.chat import ChatMessage, ChatSession
+from app.models.user import User
+from app.services import chat_writer as chat_writer_module
+from app.services.chat_writer import ChatMessageWriter
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}")
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as db:
+            db.add(User(id=1, email="writer@example.com", hashed_password="x"))
+            db.add(ChatSession(id=1, user_id=1))
+            await db.commit()
+
+    asyncio.run(setup())
+    monkeypatch.setattr(chat_writer_module, "AsyncSessionLocal", factory)
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+async def stored(factory):
+    async with factory() as db:
+        result = await db.execute(
+            select(ChatMessage.content).order_by(ChatMessage.created_at, ChatMessage.id)
+        )
+        return list(result.scalars())
+
+
+def submit(writer: ChatMessageWriter, content: str, role: str = "user") -> bool:
+    return writer.submit(session_id=1, user_id=1, role=role, content=content)
+
+
+def test_flush_keeps_submission_order_across_batches(sessions):
+    async def scenario():
+        writer = ChatMessageWriter(interval_ms=60_000, max_batch=2, max_pending=100)
+        for i in range(5):
+            assert submit(writer, f"turn {i}", role="user" if i % 2 == 0 else "assistant")
+        await writer.flush()
+        await writer.close()
+        return await stored(sessions), writer.stats()
+
+    contents, stats = asyncio.run(scenario())
+    assert contents == [f"turn {i}" for i in range(5)]
+    assert (stats["pending"], stats["flushed"]) == (0, 5)
+
+
+def test_failed_flush_keeps_the_batch_for_a_retry(sessions, monkeypatch):
+    class Unavailable:
+        async def __aenter__(self):
+            raise ConnectionError("database unavailable")
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def scenario():
+        writer = ChatMessageWriter(interval_ms=60_000, max_batch=10, max_pending=100)
+        submit(writer, "first")
+        submit(writer, "second")
+        monkeypatch.setattr(chat_writer_module, "AsyncSessionLocal", Unavailable)
+        with pytest.raises(ConnectionError):
+            await writer.flush()
+        failed = writer.stats()
+        monkeypatch.setattr(chat_writer_module, "AsyncSessionLocal", sessions)
+        submit(writer, "third")
+        await writer.flush()
+        await writer.close()
+        return failed, await stored(sessions)
+
+    failed, contents = asyncio.run(scenario())
+    assert (failed["pending"], failed["failed_flushes"]) == (2, 1)
+    assert contents == ["first", "second", "third"]
+
+
+def test_rows_the_database_rejects_are_dropped_without_blocking_the_rest(sessions):
+    async def scenario():
+        writer = ChatMessageWriter(interval_ms=60_000, max_batch=10, max_pending=100)
+        submit(writer, "before")
+        submit(writer, "rejected", role=None)  # chat_messages.role is NOT NULL
+        submit(writer, "after")
+        await writer.flush()
+        await writer.close()
+        return await stored(sessions), writer.stats()
+
+    contents, stats = asyncio.run(scenario())
+    assert contents == ["before", "after"]
+    assert (stats["pending"], stats["dropped"]) == (0, 1)
+
+
+def test_full_buffer_refuses_instead_of_growing(sessions):
+    async def scenario():
+        writer = ChatMessageWriter(interval_ms=60_000, max_batch=10, max_pending=2)
+        accepted = [submit(writer, str(i)) for i in range(3)]
+        await writer.close()
+        return accepted
+
+    assert asyncio.run(scenario()) == [True, True, False]
+
+
+def test_close_writes_out_everything_still_queued(sessions):
+    async def scenario():
+        writer = ChatMessageWriter(interval_ms=60_000, max_batch=2, max_pending=100)
+        for i in range(3):
+            submit(writer, f"turn {i}")
+        assert await stored(sessions) == []  # nothing written before the interval
+        await writer.close()
+        return await stored(sessions), writer.stats()
+
+    contents, stats = asyncio.run(scenario())
+    assert contents == ["turn 0", "turn 1", "turn 2"]
+    assert stats["pending"] == 0
+
+
+def test_periodic_flush_writes_in_the_background(sessions):
+    async def scenario():
+        writer = ChatMessageWriter(interval_ms=10, max_batch=10, max_pending=100)
+        submit(writer, "hello")
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if writer.stats()["flushed"]:
+                break
+        contents = await stored(sessions)
+        await writer.close()
+        return contents
+
+    assert asyncio.run(scenario()) == ["hello"]
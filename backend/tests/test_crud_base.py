@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import resource_version
+from app.crud.crud_assignment import assignment as crud_assignment
+from app.crud.crud_mood import mood_checkin as crud_mood
+from app.db.base import Base
+from app.models.assignment import Assignment
+from app.models.mood import MoodCheckin
+from app.models.user import User
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autoflush=False, bind=engine)
+    with factory() as db:
+        db.add(User(id=1, email="crud@example.com", hashed_password="x"))
+        db.add(Assignment(id=1, user_id=1, title="Essay", description="Draft"))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def test_update_writes_changed_columns_and_onupdate(session_factory):
+    with session_factory() as db:
+        db_obj = db.get(Assignment, 1)
+        updated = crud_assignment.update(db, db_obj=db_obj, obj_in={"title": "Final essay"})
+        assert updated.title == "Final essay"
+        assert updated.updated_at is not None
+
+    with session_factory() as db:
+        stored = db.get(Assignment, 1)
+        assert stored.title == "Final essay"
+        assert stored.description == "Draft"
+
+
+def test_update_keeps_pending_attribute_changes(session_factory):
+    with session_factory() as db:
+        db_obj = db.get(Assignment, 1)
+        db_obj.description = "Outline first"  # not flushed: the session has autoflush off
+        updated = crud_assignment.update(db, db_obj=db_obj, obj_in={"title": "Final essay"})
+        assert updated.description == "Outline first"
+
+    with session_factory() as db:
+        stored = db.get(Assignment, 1)
+        assert (stored.title, stored.description) == ("Final essay", "Outline first")
+
+
+def test_update_without_changes_still_commits_pending_attributes(session_factory):
+    with session_factory() as db:
+        db_obj = db.get(Assignment, 1)
+        db_obj.description = "Outline first"
+        crud_assignment.update(db, db_obj=db_obj, obj_in={"title": "Essay"})
+
+    with session_factory() as db:
+        assert db.get(Assignment, 1).description == "Outline first"
+
+
+def checkin(id, user_id, energy_level=3):
+    return MoodCheckin(id=id, user_id=user_id, mood_valence="neutral", energy_level=energy_level)
+
+
+@pytest.fixture
+def checkins(session_factory):
+    with session_factory() as db:
+        db.add(User(id=2, email="other@example.com", hashed_password="x"))
+        db.add_all([checkin(1, 1), checkin(2, 1), checkin(3, 2)])
+        db.commit()
+    return session_factory
+
+
+def energy_levels(db):
+    return dict(db.execute(select(MoodCheckin.id, MoodCheckin.energy_level)).all())
+
+
+def test_update_many_sets_each_row_and_bumps_its_owners_version(checkins):
+    before = resource_version("mood", 1), resource_version("mood", 2)
+    with checkins() as db:
+        updated = crud_mood.update_many(db, objs_in=[{"id": 1, "energy_level": 5}, {"id": 3, "energy_level": 1}])
+        assert updated == 2
+        assert energy_levels(db) == {1: 5, 2: 3, 3: 1}
+    after = resource_version("mood", 1), resource_version("mood", 2)
+    assert before[0] != after[0] and before[1] != after[1]
+
+
+def test_delete_many_removes_only_the_given_ids(checkins):
+    before = resource_version("mood", 2)
+    with checkins() as db:
+        assert crud_mood.delete_many(db, ids=[1, 2, 99]) == 2
+        assert energy_levels(db) == {3: 3}
+    assert resource_version("mood", 2) == before  # user 2's rows were not touched
+
+
+def test_bulk_writes_without_rows_do_nothing(checkins):
+    with checkins() as db:
+        assert crud_mood.update_many(db, objs_in=[]) == 0
+        assert crud_mood.delete_many(db, ids=[]) == 0
+        assert energy_levels(db) == {1: 3, 2: 3, 3: 3}
+
+
+def test_async_bulk_update_and_delete(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'crud.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as db:
+            db.add(User(id=1, email="crud@example.com", hashed_password="x"))
+            db.add_all([checkin(1, 1), checkin(2, 1), checkin(3, 1)])
+            await db.commit()
+            updated = await crud_mood.update_many_async(db, objs_in=[{"id": 2, "energy_level": 4}])
+            deleted = await crud_mood.delete_many_async(db, ids=[1])
+            levels = await db.run_sync(energy_levels)
+        await engine.dispose()
+        return updated, deleted, levels
+
+    assert asyncio.run(scenario()) == (1, 1, {2: 4, 3: 3})
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.ai_service import AIService
+from app.services.llm_breaker import CircuitBreaker, LLMCircuitOpen, llm_breakers
+
+
+@pytest.fixture(autouse=True)
+def breaker_settings(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BREAKER_MIN_CALLS", 4)
+    monkeypatch.setattr(settings, "LLM_BREAKER_ERROR_RATE", 0.5)
+    monkeypatch.setattr(settings, "LLM_BREAKER_WINDOW_SECONDS", 60)
+    monkeypatch.setattr(settings, "LLM_BREAKER_COOLDOWN_SECONDS", 0)
+
+
+def open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("chat_response")
+    for _ in range(4):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_opens_once_the_error_rate_is_reached():
+    breaker = CircuitBreaker("chat_response")
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == "closed"  # below LLM_BREAKER_MIN_CALLS
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_open_breaker_fails_fast_until_the_cooldown(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BREAKER_COOLDOWN_SECONDS", 3600)
+    breaker = open_breaker()
+    with pytest.raises(LLMCircuitOpen):
+        breaker.before_call()
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success():
+    breaker = open_breaker()
+    breaker.before_call()  # the probe
+    assert breaker.state == "half_open"
+    with pytest.raises(LLMCircuitOpen):
+        breaker.before_call()  # everyone else still falls back
+    breaker.record_success(0.2)
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["calls"] == 0  # the window starts over
+    breaker.before_call()
+
+
+def test_failed_probe_reopens():
+    breaker = open_breaker()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_abandoned_probe_frees_the_slot():
+    breaker = open_breaker()
+    breaker.before_call()
+    breaker.abandon()  # caller cancelled before an outcome
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+def chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class BrokenStreamBackend:
+    async def create(self, **params):
+        async def chunks():
+            yield chunk("Hello")
+            raise ConnectionError("reset by peer")
+        return chunks()
+
+
+def test_stream_failing_after_first_chunk_counts_once():
+    service = AIService()
+    service.backend = BrokenStreamBackend()
+
+    async def consume():
+        async for _ in service._stream("breaker_test", model="m", messages=[]):
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(consume())
+    snapshot = llm_breakers.get("m", "breaker_test:stream").snapshot()
+    assert (snapshot["calls"], snapshot["failures"]) == (1, 1)
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.pagination import encode_cursor, paginate
+from app.db.base import Base
+from app.models.chat import ChatMessage, ChatSession
+from app.models.user import User
+
+KEYSET = (ChatMessage.created_at, ChatMessage.id)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+    session.add(User(id=1, email="pager@example.com", hashed_password="x"))
+    session.add(ChatSession(id=1, user_id=1))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def page_through(db, limit: int, descending: bool = False):
+    seen, cursor = [], None
+    while True:
+        query = db.query(ChatMessage).filter(ChatMessage.session_id == 1)
+        page = paginate(query, KEYSET, cursor=cursor, limit=limit, descending=descending).all()
+        seen.extend(m.id for m in page)
+        if len(page) < limit:
+            return seen
+        cursor = encode_cursor([getattr(page[-1], c.key) for c in KEYSET])
+
+
+def test_pages_through_rows_inserted_together(db):
+    db.add_all([ChatMessage(session_id=1, user_id=1, role="user", content=str(i)) for i in range(5)])
+    db.commit()
+    assert page_through(db, limit=2) == [1, 2, 3, 4, 5]
+    assert page_through(db, limit=2, descending=True) == [5, 4, 3, 2, 1]
+
+
+def test_pages_through_rows_with_the_same_timestamp(db):
+    same_second = datetime(2026, 1, 5, 6, 57, 59)
+    db.add_all([ChatMessage(session_id=1, user_id=1, role="user", content=str(i), created_at=same_second) for i in range(5)])
+    db.commit()
+    assert page_through(db, limit=2) == [1, 2, 3, 4, 5]
+    assert page_through(db, limit=2, descending=True) == [5, 4, 3, 2, 1]
@@ -0,0 +1,85 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.core import rate_limit
+from app.core.config import settings
+from app.models.user import User
+
+PROXY = ("10.0.0.1", 50000)
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(rate_limit, "store", rate_limit.MemoryBucketStore())
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(settings.RATE_LIMITS, "login", "2/minute")
+    monkeypatch.setitem(settings.RATE_LIMITS, "chat_ask", "3/minute")
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_IP", "5/minute")
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", ["10.0.0.0/8"])
+
+    app = FastAPI()
+
+    @app.post("/login", dependencies=[Depends(deps.login_rate_limit)])
+    def login():
+        return {}
+
+    @app.post("/ask", dependencies=[Depends(deps.rate_limit("chat_ask"))])
+    def ask():
+        return {}
+
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=1, email="limited@example.com")
+    return app
+
+
+def login(client: TestClient, email: str, forwarded_for: str):
+    return client.post(
+        "/login",
+        data={"username": email, "password": "wrong"},
+        headers={"X-Forwarded-For": forwarded_for},
+    )
+
+
+def ask(client: TestClient, forwarded_for: str):
+    return client.post("/ask", headers={"X-Forwarded-For": forwarded_for})
+
+
+def test_route_limit_answers_429_with_retry_after(app):
+    client = TestClient(app)
+    assert [client.post("/ask").status_code for _ in range(3)] == [200, 200, 200]
+    response = client.post("/ask")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_login_limit_is_per_account_and_address(app):
+    client = TestClient(app, client=PROXY)
+    assert [login(client, "victim@example.com", "1.1.1.1").status_code for _ in range(2)] == [200, 200]
+    blocked = login(client, "Victim@example.com", "1.1.1.1")
+    assert blocked.status_code == 429
+    assert int(blocked.headers["Retry-After"]) >= 1
+    # The owner, from their own address, is not locked out by someone else's attempts
+    assert login(client, "victim@example.com", "2.2.2.2").status_code == 200
+
+
+def test_per_ip_backstop_uses_forwarded_for_only_from_trusted_proxies(app):
+    client = TestClient(app, client=PROXY)
+    statuses = [login(client, f"user{i}@example.com", "3.3.3.3").status_code for i in range(6)]
+    assert statuses == [200] * 5 + [429]
+    assert login(client, "other@example.com", "4.4.4.4").status_code == 200
+
+    # An untrusted peer cannot pick its own address for the backstop
+    direct = TestClient(app, client=("8.8.8.8", 50000))
+    statuses = [login(direct, f"user{i}@example.com", f"5.5.5.{i}").status_code for i in range(6)]
+    assert statuses == [200] * 5 + [429]
+
+
+
+def test_request_refused_by_the_ip_backstop_leaves_the_user_bucket_alone(app):
+    client = TestClient(app, client=PROXY)
+    assert [login(client, f"user{i}@example.com", "6.6.6.6").status_code for i in range(5)] == [200] * 5
+    statuses = [ask(client, "6.6.6.6").status_code for _ in range(3)]
+    assert statuses == [429] * 3
+    # The refused requests did not use up the user's chat_ask bucket
+    assert [ask(client, "7.7.7.7").status_code for _ in range(3)] == [200] * 3
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.services.single_flight import SingleFlight
+
+
+def test_identical_calls_share_one_execution():
+    async def scenario():
+        flights, calls = SingleFlight(), []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "reply"
+
+        results = await asyncio.gather(*(flights.do("chat", "k", fn) for _ in range(3)))
+        return results, calls, flights.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert results == ["reply"] * 3
+    assert len(calls) == 1
+    assert stats == {"chat": 2}
+
+
+def test_join_after_last_waiter_cancelled_starts_a_fresh_call():
+    async def scenario():
+        flights, calls = SingleFlight(), []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        first = asyncio.ensure_future(flights.do("chat", "k", fn))
+        await asyncio.sleep(0)  # the shared task is running
+        first.cancel()
+        await asyncio.sleep(0)  # first has cancelled the task, which has not finished unwinding
+        second = await flights.do("chat", "k", fn)
+        return first.cancelled(), second, len(calls)
+
+    first_cancelled, second, calls = asyncio.run(scenario())
+    assert first_cancelled
+    assert second == 2
+    assert calls == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_call_for_others():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            return "reply"
+
+        first = asyncio.ensure_future(flights.do("chat", "k", fn))
+        second = asyncio.ensure_future(flights.do("chat", "k", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "reply"